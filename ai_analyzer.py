@@ -5,52 +5,503 @@ Analyzes notes using OpenAI GPT-4 to extract concepts, links, and categories,
 then uses MarkItDown to fetch and summarize linked content.
 """
 
+import asyncio
+import contextlib
+import functools
+import hashlib
+import html
+import importlib.util
 import json
 import argparse
+import logging
 import os
+import random
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from pathlib import Path
+from typing import List, Dict, Any, BinaryIO, Callable, Iterator, Optional, Tuple
 
 try:
-    from openai import OpenAI
+    import requests
+    _TRANSIENT_URL_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
 except ImportError:
-    print("⚠️  OpenAI library not found. Installing...")
-    import subprocess
-    subprocess.run(["pip3", "install", "openai"], check=True)
-    from openai import OpenAI
+    requests = None
+    _TRANSIENT_URL_ERRORS = (ConnectionError, TimeoutError)
 
+# orjson is optional: it speeds up reading and writing large exports
 try:
-    from markitdown import MarkItDown
+    import orjson
 except ImportError:
-    print("⚠️  MarkItDown library not found. Installing...")
-    import subprocess
-    subprocess.run(["pip3", "install", "markitdown[all]"], check=True)
-    from markitdown import MarkItDown
+    orjson = None
+
+# ijson is optional: without it the input file is loaded in one go
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# python-dotenv is optional: it handles quoting and export lines in .env files
+try:
+    from dotenv import dotenv_values
+except ImportError:
+    dotenv_values = None
+
+# tqdm is optional: without it progress is logged one line per note
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+from llm_cache import LLMCache
+from rate_limiter import AsyncRateLimiter, count_tokens, estimate_tokens
+
+logger = logging.getLogger("ai_analyzer")
+
+
+# Static instructions are sent as the system message and only the note (or link) text
+# goes in the user message. These prefixes are a few hundred tokens, below the 1024
+# tokens OpenAI's prompt caching needs, so they keep requests uniform but aren't cached.
+_CATEGORIES = [
+    "Foundations & Theory",
+    "Models & Architectures",
+    "Tools & Frameworks",
+    "Experiments & Applications",
+    "Evaluation & Alignment",
+    "Society & Ethics",
+    "News & Announcements",
+]
+
+_EXTRACT_SYSTEM_PROMPT = """You are an expert assistant in content analysis and key concept extraction. Always respond with valid JSON.
+
+Analyze the note provided by the user and extract all main concepts discussed along with any mentioned links.
+
+For each identified concept, extract:
+1. A clear and concise description of the concept (in English)
+2. The associated link if present in the text
+3. A category classification from these options:
+""" + "\n".join(f'   - "{category}"' for category in _CATEGORIES) + """
+
+Respond ONLY with a JSON object in this format:
+{"concepts": [
+    {"concept": "concept description", "link": "http://example.com", "category": "category name"},
+    {"concept": "another concept", "link": "", "category": "category name"},
+    ...
+]}
+
+If there are no links for a concept, use an empty string for "link".
+If no identifiable concepts exist, return {"concepts": []}.
+Choose the most appropriate category for each concept based on its content and context."""
+
+# Structured output schema: the model is constrained to emit exactly this shape
+_CONCEPTS_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "concept": {"type": "string"},
+            "link": {"type": "string"},
+            "category": {"type": "string", "enum": _CATEGORIES}
+        },
+        "required": ["concept", "link", "category"],
+        "additionalProperties": False
+    }
+}
+
+_EXTRACT_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "concepts",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {"concepts": _CONCEPTS_SCHEMA},
+            "required": ["concepts"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Several short notes share one extraction request to amortize per-request overhead
+_GROUP_TOKEN_BUDGET = 6000
+
+_EXTRACT_GROUP_SYSTEM_PROMPT = """You are an expert assistant in content analysis and key concept extraction. Always respond with valid JSON.
+
+The user provides several notes as a JSON array of objects with "note_id", "title" and "body". Analyze each note independently and extract all main concepts discussed along with any mentioned links.
+
+For each identified concept, extract:
+1. A clear and concise description of the concept (in English)
+2. The associated link if present in the text
+3. A category classification from these options:
+""" + "\n".join(f'   - "{category}"' for category in _CATEGORIES) + """
+
+Respond ONLY with a JSON object containing one entry per note_id, in this format:
+{"notes": [
+    {"note_id": 0, "concepts": [{"concept": "concept description", "link": "http://example.com", "category": "category name"}]},
+    {"note_id": 1, "concepts": []},
+    ...
+]}
+
+If there are no links for a concept, use an empty string for "link".
+Never mix concepts of different notes.
+Choose the most appropriate category for each concept based on its content and context."""
+
+_EXTRACT_GROUP_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "notes_concepts",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "notes": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "note_id": {"type": "integer"},
+                            "concepts": _CONCEPTS_SCHEMA
+                        },
+                        "required": ["note_id", "concepts"],
+                        "additionalProperties": False
+                    }
+                }
+            },
+            "required": ["notes"],
+            "additionalProperties": False
+        }
+    }
+}
+
+_EXTRACT_PROMPT_TMPL = "Title: {title}\n\nContent:\n{body}"
+
+_EXPLAIN_SYSTEM_PROMPT = """You are an expert assistant in creating clear and concise summaries of web content.
+
+Analyze the web content provided by the user and provide a brief but clear summary in English.
+
+Provide a summary of maximum 2-3 sentences that explains:
+1. What the content is about
+2. How it relates to the reference concept
+3. The most important information
+
+Respond ONLY with the summary text, without additional formatting."""
+
+_EXPLAIN_PROMPT_TMPL = "Reference concept: {concept}\nLink: {link}\n\nContent:\n{content}"
+
+# Only http(s) links are fetched and explained
+_URL_RE = re.compile(r'^https?://', re.IGNORECASE)
+_URL_SEARCH_RE = re.compile(r'https?://', re.IGNORECASE)
+
+# Notes shorter than this (after cleaning) without any link are not worth a GPT call
+_MIN_BODY_LENGTH = 40
+
+# Link content this short is returned as its own explanation; short error pages are dropped
+_VERBATIM_CONTENT_LENGTH = 250
+_ERROR_PAGE_LENGTH = 1000
+_ERROR_PAGE_RE = re.compile(
+    r'\b(?:error 404|404 not found|page not found|403 forbidden|access denied)\b', re.IGNORECASE
+)
+
+# Note bodies are HTML; these strip markup that costs tokens without adding concepts
+_MAX_BODY_LENGTH = 6000
+_HREF_RE = re.compile(r'<a\s[^>]*?href=["\']([^"\']+)["\'][^>]*>', re.IGNORECASE)
+_DATA_IMAGE_RE = re.compile(r'data:image/[^"\'\s)>]+', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+# Extracted link content is cached on disk for a week
+_URL_CACHE_DIR = "url_cache"
+_URL_CACHE_TTL = 7 * 24 * 60 * 60
+
+# MarkItDown is blocking and network-bound, links are fetched by a dedicated thread pool
+_URL_FETCH_WORKERS = 16
+
+# Finished note analyses and explanations remembered for reuse within a run; older ones are
+# forgotten so memory doesn't grow with the input (a repeat then hits the LLM cache instead)
+_SHARED_RESULTS = 1024
+
+# Transient failures (rate limits, timeouts, 5xx) are retried with jittered
+# exponential backoff; anything else (bad request, auth) fails immediately
+_MAX_ATTEMPTS = 3
+_BACKOFF_MIN = 1.0
+_BACKOFF_MAX = 20.0
+
+# Concept extraction needs the stronger model, short link summaries do not
+_DEFAULT_EXTRACT_MODEL = "gpt-4.1"
+_DEFAULT_EXPLAIN_MODEL = "gpt-4.1-mini"
+
+
+# openai and markitdown are slow to import, so they are loaded on first use
+@functools.lru_cache(maxsize=None)
+def _openai():
+    """
+    Import the openai package, installing it if missing
+    """
+    try:
+        import openai
+    except ImportError:
+        print("⚠️  OpenAI library not found. Installing...")
+        import subprocess
+        subprocess.run(["pip3", "install", "openai"], check=True)
+        import openai
+    return openai
+
+
+@functools.lru_cache(maxsize=None)
+def _markitdown_class():
+    """
+    Import the MarkItDown class, installing markitdown if missing
+    """
+    try:
+        from markitdown import MarkItDown
+    except ImportError:
+        print("⚠️  MarkItDown library not found. Installing...")
+        import subprocess
+        subprocess.run(["pip3", "install", "markitdown[all]"], check=True)
+        from markitdown import MarkItDown
+    return MarkItDown
+
+
+def _http_client():
+    """
+    Create the pooled HTTP client shared by all OpenAI requests (HTTP/2 when h2 is installed)
+    """
+    import httpx  # installed with openai
+    return httpx.AsyncClient(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        timeout=60.0
+    )
+
+
+def _transient_api_errors() -> Tuple[type, ...]:
+    """
+    Return the OpenAI exceptions worth retrying
+    """
+    openai = _openai()
+    return (openai.RateLimitError, openai.APIConnectionError,
+            openai.APITimeoutError, openai.InternalServerError)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """
+    Read the delay suggested by the Retry-After header of a rate limit error, if any
+    """
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000.0
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except ValueError:
+        pass
+    return None
+
+
+def _clean_body(body: str) -> str:
+    """
+    Reduce a note body to plain text before sending it to GPT-4
+    
+    Keeps link targets, replaces embedded base64 images with a placeholder,
+    strips HTML tags, collapses whitespace, and caps the length.
+    """
+    body = _DATA_IMAGE_RE.sub('[img]', body)
+    body = _HREF_RE.sub(r' \1 ', body)
+    body = _TAG_RE.sub(' ', body)
+    body = html.unescape(body)
+    body = _WHITESPACE_RE.sub(' ', body).strip()
+    return body[:_MAX_BODY_LENGTH]
+
+
+def _is_trivial(body: str) -> bool:
+    """
+    Tell whether a note is too short to analyze (e.g. a shopping list) and has no link
+    
+    Args:
+        body: Note body already reduced by _clean_body
+    """
+    return len(body) < _MIN_BODY_LENGTH and not _URL_SEARCH_RE.search(body)
+
+
+def _validate_concepts(concepts: Any) -> List[Dict[str, str]]:
+    """
+    Keep the well-formed entries of a concept list returned by GPT-4, as strings
+    
+    Args:
+        concepts: Decoded "concepts" value of a response
+        
+    Returns:
+        List of dictionaries with 'concept', 'link', and 'category' keys
+        
+    Raises:
+        TypeError: If concepts is not a list
+    """
+    if not isinstance(concepts, list):
+        raise TypeError(f"concepts is a {type(concepts).__name__}, not a list")
+    return [
+        {
+            'concept': str(item.get('concept', '')),
+            'link': str(item.get('link', '')),
+            'category': str(item.get('category', ''))
+        }
+        for item in concepts if isinstance(item, dict) and 'concept' in item
+    ]
+
+
+# Errors raised when a completion doesn't have the expected shape (json.JSONDecodeError is a ValueError)
+_PARSE_ERRORS = (ValueError, KeyError, TypeError)
+
+
+def _concepts_from_response(content: str) -> List[Dict[str, str]]:
+    """
+    Parse the structured {"concepts": [...]} response of an extraction request
+    
+    Raises:
+        ValueError, KeyError or TypeError: If the response doesn't have that shape
+    """
+    return _validate_concepts(json.loads(content)['concepts'])
+
+
+def _group_concepts_from_response(content: str) -> Dict[int, List[Dict[str, str]]]:
+    """
+    Parse the {"notes": [{"note_id": ..., "concepts": [...]}, ...]} response of a grouped extraction
+    
+    Returns:
+        Concept lists keyed by note_id; malformed entries are left out
+        
+    Raises:
+        ValueError, KeyError or TypeError: If the response doesn't have that shape
+    """
+    concepts_by_id = {}
+    for entry in json.loads(content)['notes']:
+        try:
+            concepts_by_id[entry['note_id']] = _validate_concepts(entry['concepts'])
+        except (KeyError, TypeError):
+            continue
+    return concepts_by_id
+
+
+def _verbatim_explanation(content: str) -> Optional[str]:
+    """
+    Return the explanation of link content that needs no GPT call, or None
+
+    Blank content and short error pages explain to '', and content of at most
+    250 characters is its own explanation.
+    """
+    stripped = content.strip()
+    if not stripped:
+        return ""
+    if len(stripped) <= _ERROR_PAGE_LENGTH and _ERROR_PAGE_RE.search(stripped):
+        return ""
+    if len(stripped) <= _VERBATIM_CONTENT_LENGTH:
+        return stripped
+    return None
+
+
+def _json_loads(data: bytes) -> Any:
+    """
+    Parse JSON with orjson when available, falling back to the standard library
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_indented(obj: Any) -> bytes:
+    """
+    Serialize to UTF-8 JSON indented by 2 spaces, with orjson when available
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
 
 
+@contextlib.contextmanager
+def _atomic_output(output_file: str) -> Iterator[BinaryIO]:
+    """
+    Open a .part file for writing that replaces output_file once the block completes
+    
+    An interrupted run must not replace a previous output with a truncated one: on any
+    error the partial file is removed, and failures are raised as ValueError.
+    """
+    partial_file = output_file + '.part'
+    try:
+        with open(partial_file, 'wb') as f:
+            yield f
+        os.replace(partial_file, output_file)
+    except BaseException as e:
+        try:
+            os.remove(partial_file)
+        except OSError:
+            pass
+        if isinstance(e, Exception):
+            raise ValueError(f"Failed to save results to {output_file}: {e}")
+        raise
+
+
+def _backoff_delay(attempt: int, error: Optional[Exception] = None) -> float:
+    """
+    Seconds to wait before retrying after the given failed attempt (1-based)
+    
+    Honors Retry-After when the error carries one, otherwise picks a random
+    delay in an exponentially growing window capped at _BACKOFF_MAX.
+    """
+    suggested = _retry_after(error) if error is not None else None
+    if suggested is not None:
+        return min(suggested, _BACKOFF_MAX)
+    return max(_BACKOFF_MIN, random.uniform(0, min(_BACKOFF_MAX, _BACKOFF_MIN * 2 ** attempt)))
+
+
+@functools.lru_cache(maxsize=None)
 def load_env_file(file_path: str = '.env') -> Dict[str, str]:
     """
     Load environment variables from a .env file.
     
+    The file is parsed once per process; python-dotenv is used when installed.
+    
     Args:
         file_path: Path to the .env file (default: '.env' in current directory)
         
     Returns:
         Dictionary of environment variables
     """
-    env_vars = {}
     try:
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        env_vars[key.strip()] = value.strip()
+        if dotenv_values is not None:
+            if not os.path.isfile(file_path):
+                return {}
+            return {key: value for key, value in dotenv_values(file_path).items() if value is not None}
+        
+        env_vars = {}
+        for line in Path(file_path).read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                env_vars[key.strip()] = value.strip()
+        return env_vars
+    except FileNotFoundError:
+        return {}
     except Exception as e:
         print(f"⚠️  Warning: Could not read .env file: {e}")
-    return env_vars
+        return {}
+
+
+def _remember_task(tasks: "OrderedDict[Any, asyncio.Future]", key: Any, task: asyncio.Future) -> None:
+    """
+    Add a shared task, forgetting the oldest finished ones beyond _SHARED_RESULTS
+    """
+    tasks[key] = task
+    while len(tasks) > _SHARED_RESULTS:
+        oldest_key, oldest = next(iter(tasks.items()))
+        if not oldest.done():
+            break
+        del tasks[oldest_key]
 
 
 class AIAnalyzer:
@@ -58,17 +509,24 @@ class AIAnalyzer:
     Analyzes notes using AI to extract concepts and links
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True,
+                 requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None,
+                 extract_model: str = _DEFAULT_EXTRACT_MODEL, explain_model: str = _DEFAULT_EXPLAIN_MODEL):
         """
         Initialize the AI analyzer with OpenAI client and MarkItDown
         
         Args:
             api_key: OpenAI API key (if None, will try to get from environment)
+            use_cache: Reuse responses stored in the local LLM cache for identical requests
+            requests_per_minute: Client-side limit on OpenAI requests per minute (None for no limit)
+            tokens_per_minute: Client-side limit on OpenAI tokens per minute (None for no limit)
+            extract_model: Model used to extract concepts from notes
+            explain_model: Model used to explain linked content
         """
-        # Initialize OpenAI client
-        if api_key:
-            self.client = OpenAI(api_key=api_key)
-        else:
+        self.extract_model = extract_model
+        self.explain_model = explain_model
+        
+        if not api_key:
             # Try to get from environment variable first
             api_key = os.getenv('OPENAI_API_KEY')
             
@@ -82,12 +540,186 @@ class AIAnalyzer:
                     "OpenAI API key is required. Set OPENAI_API_KEY environment variable, "
                     "add it to a .env file, or pass it as argument"
                 )
-            self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
+        
+        # The OpenAI client, MarkItDown, the LLM cache and the link fetch pool are created on first use
+        self._aclient = None
+        self._md = None
+        self._session = None
+        self._md_lock = threading.Lock()
+        self._use_cache = use_cache
+        self._cache = None
+        self._url_pool = None
         
-        # Initialize MarkItDown for content extraction
-        self.markitdown = MarkItDown()
+        # Throttle concurrent requests to stay under the account's RPM/TPM limits
+        self.rate_limiter = AsyncRateLimiter(requests_per_minute, tokens_per_minute)
+        
+        # Link contents are cached on disk across runs; within a run, _content_tasks shares them
+        self.url_cache_dir = Path(_URL_CACHE_DIR) if use_cache else None
+        
+        # Link fetches, note analyses and explanations shared by the notes of a run; fetched
+        # pages are only kept while in use, the other two keep the latest _SHARED_RESULTS
+        self._content_tasks: Dict[str, asyncio.Future] = {}
+        self._note_tasks: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+        self._explain_tasks: "OrderedDict[Tuple[str, str], asyncio.Future]" = OrderedDict()
     
-    def extract_concepts_and_links(self, note_title: str, note_body: str) -> List[Dict[str, str]]:
+    @property
+    def aclient(self):
+        """
+        Async OpenAI client, created on first use (retries are handled by _chat)
+        """
+        if self._aclient is None:
+            self._aclient = _openai().AsyncOpenAI(api_key=self.api_key, max_retries=0,
+                                                  http_client=_http_client())
+        return self._aclient
+    
+    @property
+    def cache(self) -> Optional[LLMCache]:
+        """
+        Persistent cache of GPT responses keyed by the request parameters, opened on first
+        use (None when caching is off)
+        """
+        if self._cache is None and self._use_cache:
+            self._cache = LLMCache(".llm_cache.db")
+        return self._cache
+    
+    @property
+    def url_pool(self) -> ThreadPoolExecutor:
+        """
+        Thread pool fetching link contents, created on first use
+        """
+        if self._url_pool is None:
+            self._url_pool = ThreadPoolExecutor(max_workers=_URL_FETCH_WORKERS,
+                                                thread_name_prefix="url-fetch")
+        return self._url_pool
+    
+    @property
+    def markitdown(self):
+        """
+        MarkItDown converter, created on first use (links are fetched from worker threads)
+        """
+        if self._md is None:
+            with self._md_lock:
+                if self._md is None:
+                    if requests is not None:
+                        # One keep-alive pool sized for the fetch threads, reused for every link
+                        self._session = requests.Session()
+                        adapter = requests.adapters.HTTPAdapter(pool_maxsize=_URL_FETCH_WORKERS)
+                        self._session.mount("http://", adapter)
+                        self._session.mount("https://", adapter)
+                        self._md = _markitdown_class()(requests_session=self._session)
+                    else:
+                        self._md = _markitdown_class()()
+        return self._md
+    
+    async def aclose(self) -> None:
+        """
+        Close the underlying HTTP connections, the link fetch pool and the LLM cache
+        """
+        if self._url_pool is not None:
+            self._url_pool.shutdown(wait=False)
+        if self._aclient is not None:
+            await self._aclient.close()
+        if self._session is not None:
+            self._session.close()
+        if self._cache is not None:
+            self._cache.close()
+    
+    async def __aenter__(self) -> "AIAnalyzer":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def _chat(self, request: Dict[str, Any], parse: Optional[Callable[[str], Any]] = None) -> Any:
+        """
+        Run a chat completion, serving identical requests from the LLM cache
+        
+        Args:
+            request: Keyword arguments for chat.completions.create
+            parse: Function turning the content into the result; a completion is only
+                cached once it parses, so a truncated reply is requested again next time
+            
+        Returns:
+            Stripped message content of the completion, or what parse returns for it
+            
+        Raises:
+            ValueError, KeyError or TypeError: From parse, if the completion doesn't parse
+        """
+        key = LLMCache.make_key(request)
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                try:
+                    return parse(cached) if parse else cached
+                except _PARSE_ERRORS:
+                    # Stored before replies were checked; request it again
+                    pass
+        
+        # Counting the prompt tokens is only worth it when a TPM limit needs them
+        tokens = estimate_tokens(request) if self.rate_limiter.tokens_per_minute else 0
+        for attempt in range(1, _MAX_ATTEMPTS + 1):
+            await self.rate_limiter.acquire(tokens)
+            try:
+                response = await self.aclient.chat.completions.create(**request)
+                break
+            except _transient_api_errors() as e:
+                if attempt == _MAX_ATTEMPTS:
+                    raise
+                delay = _backoff_delay(attempt, e)
+                logger.warning("⚠️  OpenAI request failed (%s), retrying in %.1fs...", type(e).__name__, delay)
+                await asyncio.sleep(delay)
+        content = response.choices[0].message.content.strip()
+        result = parse(content) if parse else content
+        
+        if self.cache:
+            self.cache.set(key, content)
+        return result
+    
+    def _extract_request(self, note_title: str, note_body: str) -> Dict[str, Any]:
+        """
+        Build the chat completion parameters used to extract concepts from a note
+        
+        Args:
+            note_title: Title of the note
+            note_body: Body of the note, already reduced by _clean_body
+            
+        Returns:
+            Keyword arguments for chat.completions.create (also used as Batch API request body)
+        """
+        # Only the note-dependent part goes in the user message
+        prompt = _EXTRACT_PROMPT_TMPL.format(title=note_title, body=note_body)
+        
+        return {
+            "model": self.extract_model,
+            "messages": [
+                {"role": "system", "content": _EXTRACT_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": 1500,
+            "temperature": 0.3,
+            "response_format": _EXTRACT_RESPONSE_FORMAT
+        }
+    
+    def _parse_concepts(self, content: str) -> List[Dict[str, str]]:
+        """
+        Parse the structured {"concepts": [...]} response returned by GPT-4
+        
+        Args:
+            content: Raw message content of the completion
+            
+        Returns:
+            List of dictionaries with 'concept', 'link', and 'category' keys
+        """
+        # The schema should guarantee the shape, but a max_tokens cut-off breaks the JSON and
+        # a response that ignored the schema may lack the key or not be an object at all
+        try:
+            return _concepts_from_response(content)
+        except _PARSE_ERRORS as e:
+            logger.warning("⚠️  Failed to parse GPT response as JSON: %s (%s)", content, e)
+            return []
+    
+    async def extract_concepts_and_links(self, note_title: str, note_body: str) -> List[Dict[str, str]]:
         """
         Extract concepts, links, and categories from a note using GPT-4
         
@@ -98,83 +730,69 @@ class AIAnalyzer:
         Returns:
             List of dictionaries with 'concept', 'link', and 'category' keys
         """
-        # Prepare the prompt for GPT-4
-        prompt = f"""
-Analyze the following note and extract all main concepts discussed along with any mentioned links.
-
-Title: {note_title}
-
-Content:
-{note_body}
-
-For each identified concept, extract:
-1. A clear and concise description of the concept (in English)
-2. The associated link if present in the text
-3. A category classification from these options:
-   - "Foundations & Theory"
-   - "Models & Architectures" 
-   - "Tools & Frameworks"
-   - "Experiments & Applications"
-   - "Evaluation & Alignment"
-   - "Society & Ethics"
-   - "News & Announcements"
-
-Respond ONLY with a JSON array in this format:
-[
-    {{"concept": "concept description", "link": "http://example.com", "category": "category name"}},
-    {{"concept": "another concept", "link": "", "category": "category name"}},
-    ...
-]
-
-If there are no links for a concept, use an empty string for "link".
-If no identifiable concepts exist, return an empty array [].
-Choose the most appropriate category for each concept based on its content and context.
-"""
-
+        return await self._extract_concepts(note_title, _clean_body(note_body))
+    
+    async def _extract_concepts(self, note_title: str, note_body: str) -> List[Dict[str, str]]:
+        """
+        Extract the concepts of a note whose body is already reduced by _clean_body
+        """
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4.1",  # Note: using gpt-4 as gpt-4.1 might not be available
-                messages=[
-                    {"role": "system", "content": "You are an expert assistant in content analysis and key concept extraction. Always respond with valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1500,
-                temperature=0.3
-            )
-            
-            # Extract JSON from response
-            content = response.choices[0].message.content.strip()
-            
-            # Try to parse JSON response
-            try:
-                concepts = json.loads(content)
-                if isinstance(concepts, list):
-                    # Validate each concept entry
-                    validated_concepts = []
-                    for concept in concepts:
-                        if isinstance(concept, dict) and 'concept' in concept:
-                            validated_concept = {
-                                'concept': str(concept.get('concept', '')),
-                                'link': str(concept.get('link', '')),
-                                'category': str(concept.get('category', ''))
-                            }
-                            validated_concepts.append(validated_concept)
-                    return validated_concepts
-                else:
-                    print(f"⚠️  GPT response is not a list: {content}")
-                    return []
-            except json.JSONDecodeError as e:
-                print(f"⚠️  Failed to parse GPT response as JSON: {content}")
-                print(f"Error: {e}")
-                return []
-                
+            return await self._chat(self._extract_request(note_title, note_body), _concepts_from_response)
+        except _PARSE_ERRORS as e:
+            logger.warning("⚠️  Failed to parse GPT response as JSON: %s", e)
+            return []
         except Exception as e:
-            print(f"❌ Error calling OpenAI API: {e}")
+            logger.error("❌ Error calling OpenAI API: %s", e)
             return []
     
-    def extract_content_from_url(self, url: str) -> str:
+    def _note_tokens(self, note_title: str, note_body: str) -> int:
+        """
+        Count the prompt tokens a note (body reduced by _clean_body) contributes to an extraction request
+        """
+        prompt = _EXTRACT_PROMPT_TMPL.format(title=note_title, body=note_body)
+        return count_tokens(prompt, self.extract_model)
+    
+    async def extract_concepts_batch(self, notes: List[Dict[str, Any]],
+                                     bodies: Optional[List[str]] = None) -> List[Optional[List[Dict[str, str]]]]:
         """
-        Extract content from URL using MarkItDown
+        Extract concepts, links, and categories from several notes with a single GPT-4 call
+        
+        Args:
+            notes: Note dictionaries with 'title' and 'body' keys
+            bodies: The notes' bodies already reduced by _clean_body (None to reduce them here)
+            
+        Returns:
+            One concept list per note, in order; None where the response lacks the
+            note, so the caller can fall back to extract_concepts_and_links
+        """
+        if bodies is None:
+            bodies = [_clean_body(note.get('body', '')) for note in notes]
+        payload = [
+            {"note_id": i, "title": note.get('title', ''), "body": body}
+            for i, (note, body) in enumerate(zip(notes, bodies))
+        ]
+        request = {
+            "model": self.extract_model,
+            "messages": [
+                {"role": "system", "content": _EXTRACT_GROUP_SYSTEM_PROMPT},
+                {"role": "user", "content": json.dumps(payload, ensure_ascii=False)}
+            ],
+            "max_tokens": 1500 * len(notes),
+            "temperature": 0.3,
+            "response_format": _EXTRACT_GROUP_RESPONSE_FORMAT
+        }
+        try:
+            # Malformed entries are skipped: their notes fall back to a request of their own
+            concepts_by_id = await self._chat(request, _group_concepts_from_response)
+        except Exception as e:
+            logger.warning("⚠️  Grouped extraction failed, analyzing notes one by one: %s", e)
+            return [None] * len(notes)
+        
+        return [concepts_by_id.get(i) for i in range(len(notes))]
+    
+    async def extract_content_from_url(self, url: str) -> str:
+        """
+        Extract content from URL using MarkItDown, in the link fetch thread pool
         
         Args:
             url: URL to extract content from
@@ -182,19 +800,59 @@ Choose the most appropriate category for each concept based on its content and c
         Returns:
             Extracted content as markdown string
         """
-        if not url or not url.startswith(('http://', 'https://')):
+        if not url or not _URL_RE.match(url):
             return ""
         
-        try:
-            result = self.markitdown.convert(url)
-            return result.text_content
-        except Exception as e:
-            print(f"⚠️  Failed to extract content from {url}: {e}")
-            return ""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.url_pool, self._fetch_url_content, url)
     
-    def explain_content(self, concept: str, link: str, content: str) -> str:
+    def _fetch_url_content(self, url: str) -> str:
         """
-        Generate explanation of content using GPT-4
+        Convert a URL with MarkItDown, going through the on-disk URL cache
+        
+        Args:
+            url: URL to extract content from
+            
+        Returns:
+            Extracted content as markdown string
+        """
+        cache_path = None
+        if self.url_cache_dir:
+            key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+            cache_path = self.url_cache_dir / f"{key}.md"
+            try:
+                if time.time() - cache_path.stat().st_mtime < _URL_CACHE_TTL:
+                    return cache_path.read_text(encoding='utf-8')
+            except OSError:
+                pass
+        
+        for attempt in range(1, _MAX_ATTEMPTS + 1):
+            try:
+                result = self.markitdown.convert(url)
+                content = result.text_content
+                break
+            except _TRANSIENT_URL_ERRORS as e:
+                if attempt == _MAX_ATTEMPTS:
+                    logger.warning("⚠️  Failed to extract content from %s: %s", url, e)
+                    return ""
+                # Runs in a worker thread, so a blocking sleep is fine here
+                time.sleep(_backoff_delay(attempt))
+            except Exception as e:
+                logger.warning("⚠️  Failed to extract content from %s: %s", url, e)
+                return ""
+        
+        # Only successful extractions are cached, failures are retried next run
+        if cache_path and content:
+            try:
+                cache_path.parent.mkdir(exist_ok=True)
+                cache_path.write_text(content, encoding='utf-8')
+            except OSError as e:
+                logger.warning("⚠️  Could not cache content of %s: %s", url, e)
+        return content
+    
+    def _explain_request(self, concept: str, link: str, content: str) -> Dict[str, Any]:
+        """
+        Build the chat completion parameters used to summarize linked content
         
         Args:
             concept: The concept being explained
@@ -202,78 +860,163 @@ Choose the most appropriate category for each concept based on its content and c
             content: The extracted content
             
         Returns:
-            Brief explanation of the content
+            Keyword arguments for chat.completions.create (also used as Batch API request body)
         """
-        if not content.strip():
-            return ""
-        
         # Limit content length to avoid token limits
         max_content_length = 4000
         if len(content) > max_content_length:
             content = content[:max_content_length] + "..."
         
-        prompt = f"""
-Analyze the following web content and provide a brief but clear summary in English.
-
-Reference concept: {concept}
-Link: {link}
-
-Content:
-{content}
-
-Provide a summary of maximum 2-3 sentences that explains:
-1. What the content is about
-2. How it relates to the reference concept
-3. The most important information
-
-Respond ONLY with the summary text, without additional formatting.
-"""
-
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4.1",
-                messages=[
-                    {"role": "system", "content": "You are an expert assistant in creating clear and concise summaries of web content."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=300,
-                temperature=0.3
-            )
+        prompt = _EXPLAIN_PROMPT_TMPL.format(concept=concept, link=link, content=content)
+        
+        return {
+            "model": self.explain_model,
+            "messages": [
+                {"role": "system", "content": _EXPLAIN_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "max_tokens": 300,
+            "temperature": 0.3
+        }
+    
+    async def explain_content(self, concept: str, link: str, content: str) -> str:
+        """
+        Generate explanation of content using GPT-4
+        
+        Args:
+            concept: The concept being explained
+            link: The source link
+            content: The extracted content
             
-            return response.choices[0].message.content.strip()
+        Returns:
+            Brief explanation of the content
+        """
+        verbatim = _verbatim_explanation(content)
+        if verbatim is not None:
+            return verbatim
+        
+        try:
+            return await self._chat(self._explain_request(concept, link, content))
             
         except Exception as e:
-            print(f"❌ Error generating explanation: {e}")
+            logger.error("❌ Error generating explanation: %s", e)
             return ""
     
-    def analyze_note(self, note: Dict[str, Any]) -> Dict[str, Any]:
+    async def _shared_content(self, link: str) -> str:
+        """
+        Extract the content of a link, sharing a single fetch between all notes citing it
+        
+        Args:
+            link: URL to extract content from
+            
+        Returns:
+            Extracted content as markdown string
+        """
+        task = self._content_tasks.get(link)
+        if task is None:
+            # MarkItDown is blocking, keep it off the event loop
+            task = asyncio.ensure_future(self.extract_content_from_url(link))
+            self._content_tasks[link] = task
+        return await task
+    
+    async def _shared_explanation(self, concept: str, link: str, content: str) -> str:
+        """
+        Explain linked content, reusing the explanation when the same concept cites the same link
+        
+        Args:
+            concept: The concept being explained
+            link: The source link
+            content: The extracted content
+            
+        Returns:
+            Brief explanation of the content
+        """
+        key = (concept, link)
+        task = self._explain_tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.explain_content(concept, link, content))
+            _remember_task(self._explain_tasks, key, task)
+        return await task
+    
+    def _release_content(self, link: str) -> None:
+        """
+        Forget the fetched content of a link once it has been explained; a later note citing
+        it gets it again from the on-disk URL cache (or the network when caching is off)
+        """
+        task = self._content_tasks.get(link)
+        if task is not None and task.done():
+            del self._content_tasks[link]
+    
+    def _reset_shared_tasks(self) -> None:
+        """
+        Forget link fetches and explanations shared during a previous run
+        """
+        self._content_tasks.clear()
+        self._note_tasks.clear()
+        self._explain_tasks.clear()
+    
+    async def analyze_note(self, note: Dict[str, Any],
+                           concepts_and_links: Optional[List[Dict[str, str]]] = None,
+                           body: Optional[str] = None) -> Dict[str, Any]:
         """
         Analyze a single note to extract concepts, links, categories, and explanations
         
         Args:
             note: Note dictionary with 'title' and 'body' keys
+            concepts_and_links: Concepts already extracted for the note (None to extract them here)
+            body: The note's body already reduced by _clean_body (None to reduce it here)
             
         Returns:
             Note dictionary with added 'ai_analysis' field containing concept, link, explain, and category
         """
-        print(f"🔍 Analyzing note: '{note.get('title', 'Untitled')[:50]}...'")
+        logger.debug("🔍 Analyzing note: '%s...'", note.get('title', 'Untitled')[:50])
+        
+        if concepts_and_links is None and body is None:
+            body = _clean_body(note.get('body', ''))
+        if concepts_and_links is None and _is_trivial(body):
+            logger.debug("   Note too short, skipped")
+            note['ai_analysis'] = []
+            return note
+        
+        # Identical notes are analyzed once per run and share the result
+        digest = hashlib.sha256(
+            f"{note.get('title', '')}\0{note.get('body', '')}".encode('utf-8')
+        ).hexdigest()
+        task = self._note_tasks.get(digest)
+        if task is None:
+            task = asyncio.ensure_future(self._analyze_concepts(note, concepts_and_links, body))
+            _remember_task(self._note_tasks, digest, task)
+        else:
+            logger.debug("   Duplicate of a previous note, reusing its analysis")
+        note['ai_analysis'] = [dict(item) for item in await task]
+        return note
+    
+    async def _analyze_concepts(self, note: Dict[str, Any],
+                                concepts_and_links: Optional[List[Dict[str, str]]],
+                                body: Optional[str]) -> List[Dict[str, str]]:
+        """
+        Extract the concepts of a note (unless given) and explain their linked content
         
+        Args:
+            note: Note dictionary with 'title' and 'body' keys
+            concepts_and_links: Concepts already extracted for the note (None to extract them here)
+            body: The note's body already reduced by _clean_body (set when concepts_and_links is None)
+            
+        Returns:
+            List of dictionaries with 'concept', 'link', 'explain', and 'category' keys
+        """
         # Extract concepts and links
-        concepts_and_links = self.extract_concepts_and_links(
-            note.get('title', ''), 
-            note.get('body', '')
-        )
+        if concepts_and_links is None:
+            concepts_and_links = await self._extract_concepts(note.get('title', ''), body)
         
         if not concepts_and_links:
-            print("   No concepts found")
-            note['ai_analysis'] = []
-            return note
+            logger.debug("   No concepts found")
+            return []
         
-        print(f"   Found {len(concepts_and_links)} concept(s)")
+        logger.debug("   Found %d concept(s)", len(concepts_and_links))
         
-        # Process each concept to add explanations for links
-        ai_analysis = []
-        for item in concepts_and_links:
+        # Process the concepts concurrently so the links of a note are fetched in parallel
+        async def explain_item(item: Dict[str, str]) -> Dict[str, str]:
             concept = item.get('concept', '')
             link = item.get('link', '')
             category = item.get('category', '')
@@ -286,94 +1029,529 @@ Respond ONLY with the summary text, without additional formatting.
             }
             
             # If there's a link, try to extract and explain content
-            if link and link.startswith(('http://', 'https://')):
-                print(f"   📝 Extracting content from: {link[:50]}...")
-                content = self.extract_content_from_url(link)
+            if link and _URL_RE.match(link):
+                logger.debug("   📝 Extracting content from: %s...", link[:50])
+                content = await self._shared_content(link)
                 
                 if content:
-                    print(f"   🤖 Generating explanation...")
-                    explanation = self.explain_content(concept, link, content)
+                    logger.debug("   🤖 Generating explanation...")
+                    explanation = await self._shared_explanation(concept, link, content)
                     analysis_item['explain'] = explanation
                 else:
-                    print(f"   ⚠️  No content extracted from link")
+                    logger.debug("   ⚠️  No content extracted from link")
+                self._release_content(link)
             
-            ai_analysis.append(analysis_item)
+            return analysis_item
         
-        note['ai_analysis'] = ai_analysis
-        print(f"   ✅ Analysis complete")
-        return note
+        ai_analysis = list(await asyncio.gather(*(explain_item(item) for item in concepts_and_links)))
+        
+        logger.debug("   ✅ Analysis complete")
+        return ai_analysis
     
-    def analyze_notes_file(self, input_file: str, output_file: Optional[str] = None) -> str:
+    def _load_notes(self, input_file: str) -> List[Dict[str, Any]]:
         """
-        Analyze all notes in a JSON file
+        Load the list of notes exported by note_reader.py
         
         Args:
             input_file: Path to input JSON file
-            output_file: Path to output JSON file (if None, will auto-generate)
             
         Returns:
-            Path to output file
+            List of note dictionaries
         """
-        # Load notes from file
         try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                notes = json.load(f)
+            with open(input_file, 'rb') as f:
+                if input_file.endswith('.jsonl'):
+                    notes = [_json_loads(line) for line in f if line.strip()]
+                else:
+                    notes = _json_loads(f.read())
         except Exception as e:
             raise ValueError(f"Failed to load notes from {input_file}: {e}")
         
         if not isinstance(notes, list):
             raise ValueError("Input file must contain a list of notes")
         
-        print(f"📚 Loaded {len(notes)} notes from {input_file}")
+        logger.info("📚 Loaded %d notes from %s", len(notes), input_file)
+        return notes
+    
+    def _iter_notes(self, input_file: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the notes of an export without loading the whole file when ijson is available
+        
+        Args:
+            input_file: Path to input JSON file
+            
+        Returns:
+            Iterator of note dictionaries
+        """
+        if input_file.endswith('.jsonl'):
+            return self._iter_jsonl_notes(input_file)
+        if ijson is None:
+            return iter(self._load_notes(input_file))
+        
+        try:
+            f = open(input_file, 'rb')
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+        except Exception as e:
+            raise ValueError(f"Failed to load notes from {input_file}: {e}")
+        
+        if first != b'[':
+            f.close()
+            raise ValueError("Input file must contain a list of notes")
+        f.seek(0)
+        
+        logger.info("📚 Streaming notes from %s", input_file)
+        
+        def stream():
+            with f:
+                yield from ijson.items(f, 'item', use_float=True)
+        return stream()
+    
+    def _iter_jsonl_notes(self, input_file: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the notes of a JSON Lines export (one note per line)
+        
+        Args:
+            input_file: Path to input JSONL file
+            
+        Returns:
+            Iterator of note dictionaries
+        """
+        try:
+            f = open(input_file, 'rb')
+        except Exception as e:
+            raise ValueError(f"Failed to load notes from {input_file}: {e}")
+        
+        logger.info("📚 Streaming notes from %s", input_file)
+        
+        def stream():
+            with f:
+                for line in f:
+                    if line.strip():
+                        yield _json_loads(line)
+        return stream()
+    
+    def _default_output_file(self, input_file: str) -> str:
+        """
+        Derive the output filename from the input filename
+        """
+        base_name = os.path.splitext(input_file)[0]
+        return f"{base_name}_ai_analyzed.json"
+    
+    def _count_analysis(self, note: Dict[str, Any]) -> Tuple[int, int, int]:
+        """
+        Count concepts, links, and explanations in the analysis of a note
+        """
+        total_concepts = total_links = total_explanations = 0
+        for item in note.get('ai_analysis', ()):
+            total_concepts += 1
+            if item.get('link'):
+                total_links += 1
+            if item.get('explain'):
+                total_explanations += 1
+        return total_concepts, total_links, total_explanations
+    
+    def _print_summary(self, output_file: str, notes_processed: int, total_concepts: int,
+                       total_links: int, total_explanations: int) -> None:
+        """
+        Print the completion message and summary statistics
+        """
+        print("\n" + "=" * 60)
+        print(f"✅ AI analysis completed!")
+        print(f"📁 Results saved to: {output_file}")
+        
+        print(f"\n📊 SUMMARY:")
+        print(f"   Notes processed: {notes_processed}")
+        print(f"   Concepts extracted: {total_concepts}")
+        print(f"   Links found: {total_links}")
+        print(f"   Content explanations: {total_explanations}")
+    
+    def _save_results(self, analyzed_notes: List[Dict[str, Any]], input_file: str,
+                      output_file: Optional[str] = None) -> str:
+        """
+        Save analyzed notes and print summary statistics
+        
+        Args:
+            analyzed_notes: Notes with the 'ai_analysis' field filled in
+            input_file: Path to input JSON file (used to derive the default output name)
+            output_file: Path to output JSON file (if None, will auto-generate)
+            
+        Returns:
+            Path to output file
+        """
+        # Generate output filename if not provided
+        if output_file is None:
+            output_file = self._default_output_file(input_file)
+        
+        # Save analyzed notes
+        with _atomic_output(output_file) as f:
+            f.write(_json_dumps_indented(analyzed_notes))
+        
+        totals = [0, 0, 0]
+        for note in analyzed_notes:
+            for i, count in enumerate(self._count_analysis(note)):
+                totals[i] += count
+        self._print_summary(output_file, len(analyzed_notes), *totals)
+        return output_file
+    
+    async def analyze_notes_file(self, input_file: str, output_file: Optional[str] = None,
+                                 max_concurrency: int = 20, notes_per_request: int = 5) -> str:
+        """
+        Analyze all notes in a JSON file, running up to max_concurrency note groups at once
+        
+        Notes flow through a bounded queue: a producer streams them from disk and
+        packs consecutive short notes into groups, a pool of workers analyzes them,
+        and a writer appends each result to the output file in input order. The
+        producer stops reading while too many notes are read but not yet written,
+        so memory stays bounded even when one slow note holds back the output.
+        Results go to a .part file that replaces output_file once complete.
+        
+        Args:
+            input_file: Path to input JSON file
+            output_file: Path to output JSON file (if None, will auto-generate)
+            max_concurrency: Maximum number of note groups analyzed concurrently
+            notes_per_request: Maximum notes sharing one extraction request (1 disables grouping)
+            
+        Returns:
+            Path to output file
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        notes = self._iter_notes(input_file)
+        if output_file is None:
+            output_file = self._default_output_file(input_file)
+        
         print("🚀 Starting AI analysis...")
         print("=" * 60)
         
-        # Analyze each note
-        analyzed_notes = []
-        for i, note in enumerate(notes, 1):
-            print(f"\n[{i}/{len(notes)}] ", end="")
+        # Links and explanations repeated across notes are resolved once per run
+        self._reset_shared_tasks()
+        
+        note_queue: asyncio.Queue = asyncio.Queue(maxsize=50)
+        # Only written notes release their slot, which bounds the notes queued, being analyzed
+        # or waiting for an earlier one to be written
+        window = asyncio.Semaphore(max(200, 4 * max_concurrency * notes_per_request))
+        result_queue: asyncio.Queue = asyncio.Queue()
+        
+        async def produce() -> None:
+            group, group_tokens = [], 0
+            try:
+                for index, note in enumerate(notes, 1):
+                    if window.locked() and group:
+                        # Never wait for a slot while holding notes the writer may be waiting for
+                        await note_queue.put(group)
+                        group, group_tokens = [], 0
+                    await window.acquire()
+                    # The body is reduced once here and travels with the note
+                    body = _clean_body(note.get('body', ''))
+                    # Trivial notes are skipped by analyze_note, keep them out of the groups
+                    if _is_trivial(body):
+                        await note_queue.put([(index, note, body)])
+                        continue
+                    # A note that fills the budget on its own ends up alone in its group
+                    tokens = self._note_tokens(note.get('title', ''), body) if notes_per_request > 1 else 0
+                    if group and (len(group) >= notes_per_request
+                                  or group_tokens + tokens > _GROUP_TOKEN_BUDGET):
+                        await note_queue.put(group)
+                        group, group_tokens = [], 0
+                    group.append((index, note, body))
+                    group_tokens += tokens
+            except Exception as e:
+                raise ValueError(f"Failed to load notes from {input_file}: {e}")
+            if group:
+                await note_queue.put(group)
+            for _ in range(max_concurrency):
+                await note_queue.put(None)
+        
+        async def analyze_one(index: int, note: Dict[str, Any], body: str,
+                              concepts: Optional[List[Dict[str, str]]]) -> None:
             try:
-                analyzed_note = self.analyze_note(note)
-                analyzed_notes.append(analyzed_note)
+                logger.debug("[%d]", index)
+                note = await self.analyze_note(note, concepts, body)
             except Exception as e:
-                print(f"❌ Error analyzing note {i}: {e}")
+                logger.error("❌ Error analyzing note %d: %s", index, e)
                 # Add the note without analysis
                 note['ai_analysis'] = []
-                analyzed_notes.append(note)
+            await result_queue.put((index, note))
         
-        # Generate output filename if not provided
-        if output_file is None:
-            base_name = os.path.splitext(input_file)[0]
-            output_file = f"{base_name}_ai_analyzed.json"
+        async def work() -> None:
+            while True:
+                group = await note_queue.get()
+                if group is None:
+                    return
+                if len(group) > 1:
+                    concepts = await self.extract_concepts_batch([note for _, note, _ in group],
+                                                                 [body for _, _, body in group])
+                else:
+                    concepts = [None]
+                await asyncio.gather(*(analyze_one(index, note, body, note_concepts)
+                                       for (index, note, body), note_concepts in zip(group, concepts)))
         
-        # Save analyzed notes
+        async def write() -> List[int]:
+            # Notes finish out of order; buffer them until their turn comes
+            pending = {}
+            next_index = 1
+            totals = [0, 0, 0]
+            # A single progress line, unless per-note debug output is wanted
+            progress = None
+            if tqdm is not None and not logger.isEnabledFor(logging.DEBUG):
+                progress = tqdm(unit="note", desc="Analyzing")
+            try:
+                with _atomic_output(output_file) as f:
+                    f.write(b'[')
+                    while True:
+                        item = await result_queue.get()
+                        if item is None:
+                            break
+                        pending[item[0]] = item[1]
+                        while next_index in pending:
+                            note = pending.pop(next_index)
+                            # Same layout as dumping the whole list with indent=2
+                            f.write(b',\n  ' if next_index > 1 else b'\n  ')
+                            f.write(_json_dumps_indented(note).replace(b'\n', b'\n  '))
+                            for i, count in enumerate(self._count_analysis(note)):
+                                totals[i] += count
+                            if progress is not None:
+                                progress.update()
+                            else:
+                                logger.info("✅ [%d] %s", next_index, note.get('title', 'Untitled')[:50])
+                            next_index += 1
+                            window.release()
+                    f.write(b'\n]' if next_index > 1 else b']')
+            finally:
+                if progress is not None:
+                    progress.close()
+            return [next_index - 1] + totals
+        
+        producer = asyncio.create_task(produce())
+        workers = [asyncio.create_task(work()) for _ in range(max_concurrency)]
+        writer = asyncio.create_task(write())
+        tasks = [producer, writer] + workers
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(analyzed_notes, f, indent=2, ensure_ascii=False)
-            
-            print("\n" + "=" * 60)
-            print(f"✅ AI analysis completed!")
-            print(f"📁 Results saved to: {output_file}")
-            
-            # Print summary statistics
-            total_concepts = sum(len(note.get('ai_analysis', [])) for note in analyzed_notes)
-            total_links = sum(1 for note in analyzed_notes 
-                            for analysis in note.get('ai_analysis', []) 
-                            if analysis.get('link'))
-            total_explanations = sum(1 for note in analyzed_notes 
-                                   for analysis in note.get('ai_analysis', []) 
-                                   if analysis.get('explain'))
-            
-            print(f"\n📊 SUMMARY:")
-            print(f"   Notes processed: {len(analyzed_notes)}")
-            print(f"   Concepts extracted: {total_concepts}")
-            print(f"   Links found: {total_links}")
-            print(f"   Content explanations: {total_explanations}")
+            # The three stages are watched together: if the writer or a worker fails, the
+            # producer would otherwise wait forever for window slots nobody releases. The
+            # writer only ends after the workers, so each finished task is checked in turn
+            pending = set(tasks)
+            results_sent = False
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+                if not results_sent and producer.done() and all(worker.done() for worker in workers):
+                    await result_queue.put(None)
+                    results_sent = True
+            counts = writer.result()
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        
+        self._print_summary(output_file, *counts)
+        return output_file
+    
+    async def _run_batch(self, batch_requests: Dict[str, Dict[str, Any]], poll_interval: float,
+                         parse: Optional[Callable[[str], Any]] = None) -> Dict[str, str]:
+        """
+        Submit chat completion requests through the OpenAI Batch API and wait for the results
+        
+        Args:
+            batch_requests: Request bodies keyed by custom_id
+            poll_interval: Seconds to wait between batch status checks
+            parse: Check a completion must pass (without raising) to be cached, as in _chat
             
-            return output_file
+        Returns:
+            Message content of each successful completion, keyed by custom_id
+        """
+        # Requests already answered in a previous run are served from the cache
+        results = {}
+        pending = {}
+        for custom_id, body in batch_requests.items():
+            cached = self.cache.get(LLMCache.make_key(body)) if self.cache else None
+            if cached is not None and self._parses(cached, parse):
+                results[custom_id] = cached
+            else:
+                pending[custom_id] = body
+        
+        if not pending:
+            return results
+        
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            }, ensure_ascii=False)
+            for custom_id, body in pending.items()
+        ]
+        payload = ("\n".join(lines) + "\n").encode('utf-8')
+        
+        batch_input = await self.aclient.files.create(file=("batch_input.jsonl", payload), purpose="batch")
+        batch = await self.aclient.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.info("   📦 Submitted batch %s with %d request(s)", batch.id, len(pending))
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            batch = await self.aclient.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            if counts is not None:
+                logger.info("   ⏳ Batch %s: %s (%d/%d)", batch.id, batch.status, counts.completed, counts.total)
+        
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error("❌ Batch %s ended with status '%s'", batch.id, batch.status)
+            return results
+        
+        output = await self.aclient.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get('response') or {}
+            if record.get('error') or response.get('status_code') != 200:
+                logger.warning("⚠️  Batch request %s failed: %s", record.get('custom_id'), record.get('error') or response.get('status_code'))
+                continue
+            try:
+                custom_id = record['custom_id']
+                content = response['body']['choices'][0]['message']['content'].strip()
+            except (KeyError, IndexError, TypeError, AttributeError):
+                logger.warning("⚠️  Unexpected batch response for %s", record.get('custom_id'))
+                continue
+            results[custom_id] = content
+            if self.cache and custom_id in pending and self._parses(content, parse):
+                self.cache.set(LLMCache.make_key(pending[custom_id]), content)
+        return results
+    
+    @staticmethod
+    def _parses(content: str, parse: Optional[Callable[[str], Any]]) -> bool:
+        """
+        Tell whether a completion passes parse (always True without one)
+        """
+        if parse is None:
+            return True
+        try:
+            parse(content)
+            return True
+        except _PARSE_ERRORS:
+            return False
+    
+    async def analyze_notes_file_batch(self, input_file: str, output_file: Optional[str] = None,
+                                       poll_interval: float = 30.0) -> str:
+        """
+        Analyze all notes in a JSON file through the OpenAI Batch API
+        
+        Cheaper than analyze_notes_file but completes within the 24h batch window,
+        so it is meant for non-interactive re-analysis of existing exports. Concepts
+        are extracted in a first batch; a second batch explains the linked content.
+        
+        Args:
+            input_file: Path to input JSON file
+            output_file: Path to output JSON file (if None, will auto-generate)
+            poll_interval: Seconds to wait between batch status checks
             
-        except Exception as e:
-            raise ValueError(f"Failed to save results to {output_file}: {e}")
+        Returns:
+            Path to output file
+        """
+        notes = self._load_notes(input_file)
+        print("🚀 Starting AI batch analysis...")
+        print("=" * 60)
+        
+        # First pass: concept extraction, one request per note worth analyzing
+        logger.info("🔍 Extracting concepts...")
+        extract_requests = {}
+        for i, note in enumerate(notes):
+            body = _clean_body(note.get('body', ''))
+            if not _is_trivial(body):
+                extract_requests[f"note-{i}"] = self._extract_request(note.get('title', ''), body)
+        extracted = await self._run_batch(extract_requests, poll_interval, _concepts_from_response)
+        
+        for i, note in enumerate(notes):
+            concepts = self._parse_concepts(extracted.get(f"note-{i}", '{"concepts": []}'))
+            note['ai_analysis'] = [
+                {
+                    'concept': item['concept'],
+                    'link': item['link'],
+                    'explain': '',
+                    'category': item['category']
+                }
+                for item in concepts
+            ]
+        
+        # Fetch every distinct link once, in the link fetch thread pool
+        links = {
+            item['link'] for note in notes for item in note['ai_analysis']
+            if _URL_RE.match(item['link'])
+        }
+        if links:
+            logger.info("📝 Extracting content from %d link(s)...", len(links))
+        link_list = list(links)
+        contents = await asyncio.gather(
+            *(self.extract_content_from_url(link) for link in link_list)
+        )
+        link_content = dict(zip(link_list, contents))
+        
+        # Second pass: explanations, one per distinct (concept, link) pair whose link produced content
+        # (short or blank content is explained without a request)
+        explain_ids = {}
+        explain_requests = {}
+        verbatim = {}
+        for note in notes:
+            for item in note['ai_analysis']:
+                key = (item['concept'], item['link'])
+                if key in explain_ids or key in verbatim:
+                    continue
+                content = link_content.get(item['link'], '')
+                explanation = _verbatim_explanation(content)
+                if explanation is not None:
+                    verbatim[key] = explanation
+                else:
+                    explain_ids[key] = f"explain-{len(explain_ids)}"
+                    explain_requests[explain_ids[key]] = self._explain_request(
+                        item['concept'], item['link'], content
+                    )
+        
+        explanations = {}
+        if explain_requests:
+            logger.info("🤖 Generating explanations...")
+            explanations = await self._run_batch(explain_requests, poll_interval)
+        for note in notes:
+            for item in note['ai_analysis']:
+                key = (item['concept'], item['link'])
+                if key in verbatim:
+                    item['explain'] = verbatim[key]
+                else:
+                    item['explain'] = explanations.get(explain_ids.get(key), '')
+        
+        return self._save_results(notes, input_file, output_file)
+
+
+async def _test_connection(analyzer: AIAnalyzer) -> None:
+    """
+    Send a minimal request to verify the OpenAI API connection
+    """
+    async with analyzer:
+        await analyzer.aclient.chat.completions.create(
+            model=analyzer.extract_model,
+            messages=[{"role": "user", "content": "Hello, this is a test."}],
+            max_tokens=10
+        )
+
+
+async def _analyze(analyzer: AIAnalyzer, input_file: str, output_file: Optional[str],
+                   max_concurrency: int, batch: bool = False, notes_per_request: int = 5) -> str:
+    """
+    Run the analysis of a notes file and release the HTTP connections afterwards
+    """
+    async with analyzer:
+        if batch:
+            return await analyzer.analyze_notes_file_batch(input_file, output_file)
+        return await analyzer.analyze_notes_file(input_file, output_file, max_concurrency,
+                                                 notes_per_request)
 
 
 def main():
@@ -388,6 +1566,7 @@ Examples:
   python3 ai_analyzer.py notes_export_last_5.json
   python3 ai_analyzer.py notes_export_last_5.json -o analyzed_notes.json
   python3 ai_analyzer.py notes_export_last_5.json --api-key sk-your-key-here
+  python3 ai_analyzer.py notes_export_last_5.json --batch
 
 Environment Variables:
   OPENAI_API_KEY    OpenAI API key (can be set via environment variable, .env file, or --api-key parameter)
@@ -406,9 +1585,37 @@ Environment Variables:
                        help='OpenAI API key (or set OPENAI_API_KEY environment variable)')
     parser.add_argument('--test', action='store_true',
                        help='Test API connection without processing notes')
+    parser.add_argument('--concurrency', type=int, default=20,
+                       help='Maximum number of note groups (up to --notes-per-request notes each) '
+                            'analyzed concurrently (default: 20)')
+    parser.add_argument('--notes-per-request', type=int, default=5,
+                       help='Maximum short notes sharing one extraction request (default: 5, 1 disables grouping)')
+    parser.add_argument('--batch', action='store_true',
+                       help='Use the OpenAI Batch API (lower cost, results within 24h)')
+    parser.add_argument('--extract-model', default=_DEFAULT_EXTRACT_MODEL,
+                       help=f'Model used to extract concepts from notes (default: {_DEFAULT_EXTRACT_MODEL})')
+    parser.add_argument('--explain-model', default=_DEFAULT_EXPLAIN_MODEL,
+                       help=f'Model used to explain linked content (default: {_DEFAULT_EXPLAIN_MODEL})')
+    parser.add_argument('--rpm', type=int, default=None,
+                       help='Maximum OpenAI requests per minute (default: no client-side limit)')
+    parser.add_argument('--tpm', type=int, default=None,
+                       help='Maximum OpenAI tokens per minute (default: no client-side limit)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignore the local LLM response cache (.llm_cache.db) and link cache (url_cache/)')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                       help='Show per-note and per-link progress instead of a single progress line')
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s")
+    # Keep HTTP client debug chatter out of --verbose output
+    for name in ("openai", "httpx", "httpcore", "urllib3"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    
+    if args.concurrency < 1:
+        print("❌ --concurrency must be at least 1")
+        return 1
+    
     # Check if input file exists
     if not os.path.exists(args.input_file):
         print(f"❌ Input file not found: {args.input_file}")
@@ -419,17 +1626,15 @@ Environment Variables:
     
     try:
         # Initialize analyzer
-        analyzer = AIAnalyzer(api_key=args.api_key)
+        analyzer = AIAnalyzer(api_key=args.api_key, use_cache=not args.no_cache,
+                              requests_per_minute=args.rpm, tokens_per_minute=args.tpm,
+                              extract_model=args.extract_model, explain_model=args.explain_model)
         
         # Test API connection if requested
         if args.test:
             print("🔗 Testing OpenAI API connection...")
             try:
-                response = analyzer.client.chat.completions.create(
-                    model="gpt-4.1",
-                    messages=[{"role": "user", "content": "Hello, this is a test."}],
-                    max_tokens=10
-                )
+                asyncio.run(_test_connection(analyzer))
                 print("✅ OpenAI API connection successful!")
                 return 0
             except Exception as e:
@@ -437,7 +1642,8 @@ Environment Variables:
                 return 1
         
         # Process notes
-        output_file = analyzer.analyze_notes_file(args.input_file, args.output)
+        output_file = asyncio.run(_analyze(analyzer, args.input_file, args.output,
+                                           args.concurrency, args.batch, args.notes_per_request))
         print(f"\n🎉 Processing completed successfully!")
         print(f"📁 Output file: {output_file}")
         
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+LLM Cache for Note Voyeur
+Persistent exact-match cache of OpenAI responses, stored in a local SQLite database
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+
+class LLMCache:
+    """
+    SQLite-backed key/value store for chat completion responses
+    """
+
+    def __init__(self, cache_path: str = ".llm_cache.db"):
+        """
+        Open (or create) the cache database
+
+        Args:
+            cache_path: Path to the SQLite database file
+        """
+        self.conn = sqlite3.connect(cache_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (k TEXT PRIMARY KEY, v TEXT, ts INTEGER)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """
+        Compute the cache key of a chat completion request
+
+        Args:
+            request: Keyword arguments passed to chat.completions.create
+
+        Returns:
+            SHA-256 hex digest of the canonical JSON encoding of the request
+        """
+        canonical = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached response for key, or None on a miss
+        """
+        row = self.conn.execute("SELECT v FROM cache WHERE k = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store the response for key, replacing any previous value
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO cache (k, v, ts) VALUES (?, ?, ?)",
+            (key, value, int(time.time()))
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        """
+        Close the database connection
+        """
+        self.conn.close()
@@ -1,49 +1,965 @@
 #!/usr/bin/env python3
 """
 Note Reader for macOS Notes App
-Reads and displays all notes from the default Notes account
+Reads and displays the notes of every Notes account (iCloud, On My Mac, ...)
 """
 
 import subprocess
+import sys
 import json
-from datetime import datetime, timedelta
+import atexit
+import gzip
+import hashlib
+import os
+import re
+import select
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, partial
+from urllib.parse import quote
 import argparse
 
+# orjson is optional: it speeds up writing exports and the notes cache
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def read_all_notes(limit=10):
+# zstandard is optional: it is only needed to write compressed .zst exports
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# PyObjC's OSAKit is optional: it runs scripts inside this process instead of in osascript
+try:
+    from Foundation import NSAppleEventDescriptor
+    from OSAKit import OSALanguage, OSAScript
+except ImportError:
+    OSAScript = None
+
+# PyObjC's Scripting Bridge is optional: it queries Notes in-process instead of spawning osascript
+try:
+    from Foundation import NSDate, NSPredicate
+    from ScriptingBridge import SBApplication
+except ImportError:
+    SBApplication = None
+
+
+# Notes keeps its data in a Core Data SQLite store; reading it directly avoids
+# driving the Notes app through AppleScript (requires Full Disk Access)
+NOTES_DB_PATH = os.path.expanduser("~/Library/Group Containers/group.com.apple.notes/NoteStore.sqlite")
+
+# Core Data timestamps count seconds from 2001-01-01 instead of 1970-01-01
+CORE_DATA_EPOCH = 978307200
+
+# Prefix added to the title of extracted notes by --mark; marked notes are never extracted again
+VOYEUR_MARKER = "NOTE-VOYEUR: TARGET ACQUIRED!"
+_VOYEUR_MARKER_FOLDED = VOYEUR_MARKER.casefold()
+
+# Characters of text read per note in preview mode (instead of the full HTML body)
+PREVIEW_LENGTH = 200
+
+# Notes read through the Scripting Bridge or JXA by previous runs, reused while the modification
+# dates of the notes are unchanged (set to None to disable); the SQLite reader is fast enough without
+# it and doesn't keep another copy of the notes
+NOTES_CACHE_PATH = os.path.expanduser("~/.cache/note-voyeur/cache.json")
+NOTES_CACHE_ENTRIES = 16
+
+# Scripts compiled once with osacompile, so osascript doesn't parse them on every run
+SCRIPTS_CACHE_DIR = os.path.expanduser("~/.cache/note-voyeur/scripts")
+
+
+def _json_dumps(obj, indent=False):
     """
-    Reads the latest notes from macOS Notes app using AppleScript
-    Returns a string with note information
+    Serialize to UTF-8 JSON (indented by 2 spaces if indent), with orjson when available
     """
-    script = f'''
-    tell application "Notes"
-        set noteList to ""
-        set noteCount to 0
-        repeat with n in notes of default account
-            set noteCount to noteCount + 1
-            if noteCount > {limit} then exit repeat
-            set noteList to noteList & the name of n & " -> " & the body of n & "\n"
-        end repeat
-        return noteList
-    end tell
-    '''
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+# Last parsed notes cache, as (path, file signature, cache), so one lookup doesn't parse it again
+_notes_cache_parsed = (None, None, {})
+
+
+def _notes_cache_file_signature():
+    """
+    Identity of the current notes cache file, None if it doesn't exist
+    """
+    try:
+        stat = os.stat(NOTES_CACHE_PATH)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _load_notes_cache():
+    """
+    Load the notes cache file, returning an empty cache if it is disabled, missing or corrupt
+    (the file is only parsed again once it has changed; the result must not be modified)
+    """
+    global _notes_cache_parsed
+    if not NOTES_CACHE_PATH:
+        return {}
+    signature = _notes_cache_file_signature()
+    path, parsed_signature, cache = _notes_cache_parsed
+    if signature is not None and path == NOTES_CACHE_PATH and parsed_signature == signature:
+        return cache
+    try:
+        with open(NOTES_CACHE_PATH, 'rb') as f:
+            data = f.read()
+        cache = orjson.loads(data) if orjson is not None else json.loads(data)
+    except (OSError, ValueError):
+        return {}
+    _notes_cache_parsed = (NOTES_CACHE_PATH, signature, cache)
+    return cache
+
+
+def _notes_store_signature():
+    """
+    Modification time and size of the Notes store and its WAL, which change whenever Notes
+    saves anything; None if the store can't be seen (it needs Full Disk Access)
+    """
+    signature = []
+    for path in (NOTES_DB_PATH, NOTES_DB_PATH + "-wal"):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if path == NOTES_DB_PATH:
+                return None
+            signature.append(None)
+            continue
+        except OSError:
+            return None
+        signature.append([stat.st_mtime_ns, stat.st_size])
+    return signature
+
+
+def _cached_notes(key, fingerprint=None):
+    """
+    Return the data cached for a query if it was stored with the same fingerprint, or without
+    a fingerprint if the Notes store files haven't changed since; None otherwise
+    """
+    entry = _load_notes_cache().get(key)
+    if not entry:
+        return None
+    if fingerprint is None:
+        signature = _notes_store_signature()
+        return entry["data"] if signature is not None and entry.get("store") == signature else None
+    return entry["data"] if entry.get("fingerprint") == fingerprint else None
+
+
+def _store_notes_cache(key, fingerprint, data):
+    """
+    Remember the data read for a query, keeping only the most recent queries
+    """
+    global _notes_cache_parsed
+    if not NOTES_CACHE_PATH:
+        return
+    # Entries of the SQLite reader left by earlier versions are dropped
+    cache = {k: v for k, v in _load_notes_cache().items() if not k.startswith("sqlite|")}
+    cache.pop(key, None)
+    cache[key] = {"fingerprint": fingerprint, "store": _notes_store_signature(), "data": data}
+    while len(cache) > NOTES_CACHE_ENTRIES:
+        cache.pop(next(iter(cache)))
+    try:
+        # The cache holds note contents, which only the user may read (like the Notes store)
+        cache_dir = os.path.dirname(NOTES_CACHE_PATH)
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        # Also tighten a directory created by earlier versions
+        os.chmod(cache_dir, 0o700)
+        # Write aside and rename, so a concurrent or interrupted run never sees half a file
+        tmp_path = f"{NOTES_CACHE_PATH}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_json_dumps(cache))
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, NOTES_CACHE_PATH)
+    except OSError as e:
+        print(f"Could not write notes cache: {e}")
+        return
+    _notes_cache_parsed = (NOTES_CACHE_PATH, _notes_cache_file_signature(), cache)
+
+
+@lru_cache(maxsize=None)
+def _compiled_script(source, language="AppleScript"):
+    """
+    Compile a script to a .scpt file named after its source, reusing it across runs
+    
+    Args:
+        source: Script source (parameters come from argv, never from the source)
+        language: OSA language of the source ("AppleScript" or "JavaScript")
     
+    Returns:
+        Path of the compiled script, or None if it couldn't be compiled
+    """
+    digest = hashlib.sha1(f"{language}\n{source}".encode('utf-8')).hexdigest()[:16]
+    path = os.path.join(SCRIPTS_CACHE_DIR, f"{digest}.scpt")
+    if os.path.exists(path):
+        return path
     try:
-        result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True, timeout=30)
-        if result.returncode == 0:
-            return result.stdout
-        else:
-            print(f"Error executing AppleScript: {result.stderr}")
+        os.makedirs(SCRIPTS_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        # The source is read from stdin; only the exit status matters
+        result = subprocess.run(["osacompile", "-l", language, "-o", tmp_path], input=source.encode('utf-8'),
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
+        if result.returncode != 0:
+            return None
+        os.replace(tmp_path, path)
+        return path
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+# Long-lived JXA interpreter running the scripts sent on its stdin, one JSON request
+# per line ({source, language, args}) answered by one JSON line ({ok, stdout|stderr}),
+# so repeated calls don't each pay for starting osascript and connecting to Notes
+_SESSION_SCRIPT = """
+ObjC.import("Foundation");
+function run() {
+    const app = Application.currentApplication();
+    app.includeStandardAdditions = true;
+    const input = $.NSFileHandle.fileHandleWithStandardInput;
+    const output = $.NSFileHandle.fileHandleWithStandardOutput;
+    const handlers = {};
+    let buffer = "";
+    while (true) {
+        const data = input.availableData;
+        if (data.length === 0) return "";
+        // Requests are ASCII-only JSON, so chunks never split a character
+        buffer += $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding).js;
+        let newline;
+        while ((newline = buffer.indexOf("\\n")) >= 0) {
+            const request = JSON.parse(buffer.slice(0, newline));
+            buffer = buffer.slice(newline + 1);
+            let response;
+            try {
+                let result;
+                if (request.language === "JavaScript") {
+                    if (!handlers[request.source]) {
+                        handlers[request.source] = eval("(function () {\\n" + request.source + "\\nreturn run;\\n})()");
+                    }
+                    result = handlers[request.source](request.args);
+                } else {
+                    result = app.runScript(request.source, {in: "AppleScript", withParameters: request.args});
+                }
+                response = {ok: true, stdout: result === undefined || result === null ? "" : String(result)};
+            } catch (e) {
+                response = {ok: false, stderr: String(e)};
+            }
+            output.writeData($(JSON.stringify(response) + "\\n").dataUsingEncoding($.NSUTF8StringEncoding));
+        }
+    }
+}
+"""
+
+_session_lock = threading.Lock()
+_session_proc = None
+_session_disabled = False
+
+
+def _close_osascript_session():
+    """
+    Stop the long-lived osascript process, if any
+    """
+    global _session_proc
+    if _session_proc is not None:
+        try:
+            _session_proc.stdin.close()
+            _session_proc.wait(timeout=5)
+        except (OSError, subprocess.SubprocessError):
+            _session_proc.kill()
+        _session_proc = None
+
+
+atexit.register(_close_osascript_session)
+
+
+def _run_in_session(source, args, language, timeout):
+    """
+    Run a script in the long-lived osascript process, starting it on first use
+    
+    Returns:
+        subprocess.CompletedProcess like a one-off osascript run, or None if the session
+        is unavailable and the script should be run in its own process
+    
+    Raises:
+        subprocess.TimeoutExpired: If the script didn't answer within timeout seconds
+    """
+    global _session_proc, _session_disabled
+    with _session_lock:
+        if _session_disabled:
+            return None
+        if _session_proc is None or _session_proc.poll() is not None:
+            # stdin carries the requests, so the server script itself is run from its compiled
+            # copy and only passed with -e when it can't be compiled
+            compiled = _compiled_script(_SESSION_SCRIPT, "JavaScript")
+            command = ["osascript", compiled] if compiled else ["osascript", "-l", "JavaScript", "-e", _SESSION_SCRIPT]
+            try:
+                _session_proc = subprocess.Popen(command,
+                                                 stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                                 stderr=subprocess.DEVNULL)
+            except OSError:
+                _session_disabled = True
+                return None
+        
+        request = json.dumps({"source": source, "language": language, "args": [str(arg) for arg in args]})
+        response = b""
+        deadline = time.monotonic() + timeout
+        try:
+            _session_proc.stdin.write(request.encode('ascii') + b"\n")
+            _session_proc.stdin.flush()
+            fd = _session_proc.stdout.fileno()
+            while not response.endswith(b"\n"):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                    # The session is stuck in the script, start a fresh one next time
+                    _session_proc.kill()
+                    _session_proc = None
+                    raise subprocess.TimeoutExpired("osascript", timeout)
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    raise OSError("osascript session exited")
+                response += chunk
+        except OSError:
+            # The session died before answering; don't rely on it for the rest of the run
+            _close_osascript_session()
+            _session_disabled = True
+            return None
+    
+    data = json.loads(response)
+    if data["ok"]:
+        return subprocess.CompletedProcess("osascript", 0, data["stdout"] + "\n", "")
+    return subprocess.CompletedProcess("osascript", 1, "", data["stderr"])
+
+
+_osa_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _osa_script(source, language):
+    """
+    Compile a script once with OSAKit
+    
+    Returns:
+        The compiled OSAScript, or None if it doesn't compile
+    """
+    script = OSAScript.alloc().initWithSource_language_(source, OSALanguage.languageForName_(language))
+    compiled, _ = script.compileAndReturnError_(None)
+    return script if compiled else None
+
+
+# Four-character codes of the run event ('aevt'/'oapp') and of its direct parameter ('----')
+_K_CORE_EVENT_CLASS = 0x61657674
+_K_AE_OPEN_APPLICATION = 0x6F617070
+_KEY_DIRECT_OBJECT = 0x2D2D2D2D
+
+
+def _run_event(args):
+    """
+    Build the run event osascript sends to a script: its direct parameter is the argv list
+    """
+    argv = NSAppleEventDescriptor.listDescriptor()
+    for index, arg in enumerate(args, 1):
+        argv.insertDescriptor_atIndex_(NSAppleEventDescriptor.descriptorWithString_(str(arg)), index)
+    event = NSAppleEventDescriptor.appleEventWithEventClass_eventID_targetDescriptor_returnID_transactionID_(
+        _K_CORE_EVENT_CLASS, _K_AE_OPEN_APPLICATION, NSAppleEventDescriptor.currentProcessDescriptor(), -1, 0)
+    event.setParamDescriptor_forKeyword_(argv, _KEY_DIRECT_OBJECT)
+    return event
+
+
+def _run_in_process(source, args, language):
+    """
+    Run a script inside this process with OSAKit, sending its run handler args as argv
+    (Apple events sent by the script keep their own timeout, the osascript timeout doesn't apply)
+    
+    Returns:
+        subprocess.CompletedProcess like a successful osascript run, or None if OSAKit is
+        unavailable, can't compile the script or the script failed, so that it is run with
+        osascript instead (scripts return text, coercing other results themselves)
+    """
+    if OSAScript is None:
+        return None
+    # OSA components aren't thread-safe, scripts run one at a time
+    with _osa_lock:
+        script = _osa_script(source, language)
+        if script is None:
             return None
+        result, _ = script.executeAppleEvent_error_(_run_event(args), None)
+    if result is None or result.stringValue() is None:
+        return None
+    return subprocess.CompletedProcess("osascript", 0, f"{result.stringValue()}\n", "")
+
+
+def _run_osascript(source, args=(), language="AppleScript", timeout=30):
+    """
+    Run a script with osascript, passing args to its run handler (in-process with OSAKit when
+    available, then through the long-lived session, then in its own osascript process)
+    
+    Args:
+        source: Script source, run from its compiled copy when osacompile is available
+        args: Strings passed as argv to the script's run handler
+        language: OSA language of the source ("AppleScript" or "JavaScript")
+        timeout: Seconds to wait for osascript
+    
+    Returns:
+        subprocess.CompletedProcess of the osascript run
+    """
+    result = _run_in_process(source, args, language)
+    if result is not None:
+        return result
+    result = _run_in_session(source, args, language, timeout)
+    if result is not None:
+        return result
+    
+    compiled = _compiled_script(source, language)
+    if compiled:
+        command, source_input = ["osascript", compiled], None
+    else:
+        # "-" reads the program from stdin instead of copying it into the argument list
+        command, source_input = ["osascript", "-l", language, "-"], source.encode('utf-8')
+    result = subprocess.run(command + [str(arg) for arg in args], input=source_input,
+                            capture_output=True, timeout=timeout)
+    # osascript writes UTF-8 whatever the locale; decode the whole output once
+    result.stdout = result.stdout.decode('utf-8', errors='replace')
+    result.stderr = result.stderr.decode('utf-8', errors='replace')
+    return result
+
+
+def _osascript_output(source, args=(), language="AppleScript", timeout=30):
+    """
+    Run a script with osascript and return its output, printing the reason of any failure
+    
+    Returns:
+        The script's stdout, or None if it failed or timed out
+    """
+    try:
+        result = _run_osascript(source, args, language, timeout)
     except subprocess.TimeoutExpired:
-        print("AppleScript execution timed out after 30 seconds")
+        print(f"{language} execution timed out after {timeout} seconds")
         return None
     except Exception as e:
         print(f"Error running subprocess: {e}")
         return None
+    if result.returncode != 0:
+        print(f"Error executing {language}: {result.stderr.strip()}")
+        return None
+    return result.stdout
+
+
+def _open_notes_db():
+    """
+    Open the Notes SQLite store read-only
+    Returns a sqlite3 connection, or None if the store is missing or not readable
+    """
+    if not os.path.exists(NOTES_DB_PATH):
+        return None
+    try:
+        # mode=ro rather than immutable=1: Notes writes through a WAL that must still be read
+        return sqlite3.connect(f"file:{quote(NOTES_DB_PATH)}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+
+
+def _notes_query_parts(conn, from_date=None, to_date=None):
+    """
+    Build the FROM/WHERE clause selecting readable notes, adapted to the store's schema version
+    
+    Args:
+        conn: Connection to the Notes store
+        from_date: Only notes modified on or after this day (from 00:00:00)
+        to_date: Only notes modified up to this day (until 23:59:59)
+    
+    Returns:
+        tuple: (sql fragment, parameters, column names); the note data table is joined as d
+        and the snippet column is None when the schema has none
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(ZICCLOUDSYNCINGOBJECT)")}
+    # Column suffixes changed between macOS releases
+    title_col = next(c for c in ("ZTITLE1", "ZTITLE") if c in columns)
+    created_col = next(c for c in ("ZCREATIONDATE3", "ZCREATIONDATE1", "ZCREATIONDATE") if c in columns)
+    modified_col = next(c for c in ("ZMODIFICATIONDATE1", "ZMODIFICATIONDATE") if c in columns)
+    snippet_col = "ZSNIPPET" if "ZSNIPPET" in columns else None
+    
+    # Notes of every account are selected, like the application-wide notes the
+    # Scripting Bridge, JXA and AppleScript fallbacks read
+    sql = "FROM ZICCLOUDSYNCINGOBJECT n JOIN ZICNOTEDATA d ON d.Z_PK = n.ZNOTEDATA"
+    conditions = [f"n.{title_col} IS NOT NULL"]
+    params = []
+    if "ZMARKEDFORDELETION" in columns:
+        conditions.append("COALESCE(n.ZMARKEDFORDELETION, 0) = 0")
+    if "ZISPASSWORDPROTECTED" in columns:
+        # Locked notes are encrypted, AppleScript cannot read them either
+        conditions.append("COALESCE(n.ZISPASSWORDPROTECTED, 0) = 0")
+    if "ZFOLDERTYPE" in columns:
+        # Skip the "Recently Deleted" folder
+        sql += " LEFT JOIN ZICCLOUDSYNCINGOBJECT f ON f.Z_PK = n.ZFOLDER"
+        conditions.append("COALESCE(f.ZFOLDERTYPE, 0) != 1")
+    
+    if from_date is not None:
+        start = datetime(from_date.year, from_date.month, from_date.day)
+        conditions.append(f"n.{modified_col} >= ?")
+        params.append(start.timestamp() - CORE_DATA_EPOCH)
+    if to_date is not None:
+        end = datetime(to_date.year, to_date.month, to_date.day, 23, 59, 59)
+        # Same bounds as the AppleScript filters: inclusive in a range, exclusive alone
+        conditions.append(f"n.{modified_col} {'<=' if from_date is not None else '<'} ?")
+        params.append(end.timestamp() - CORE_DATA_EPOCH)
+    
+    sql += " WHERE " + " AND ".join(conditions)
+    return sql, params, (title_col, created_col, modified_col, snippet_col)
+
+
+def _read_varint(data, pos):
+    """
+    Decode a protobuf varint starting at pos
+    Returns (value, position after the varint)
+    """
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _protobuf_field(data, field_number):
+    """
+    Return the payload of the first length-delimited protobuf field with this number, or None
+    """
+    pos = 0
+    while pos < len(data):
+        key, pos = _read_varint(data, pos)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            _, pos = _read_varint(data, pos)
+        elif wire_type == 1:
+            pos += 8
+        elif wire_type == 2:
+            length, pos = _read_varint(data, pos)
+            if number == field_number:
+                return data[pos:pos + length]
+            pos += length
+        elif wire_type == 5:
+            pos += 4
+        else:
+            return None
+    return None
+
+
+def _decode_note_body(zdata):
+    """
+    Extract the plain text of a note from its gzipped protobuf ZDATA blob
+    (NoteStoreProto -> Document (field 2) -> Note (field 3) -> note_text (field 2))
+    A truncated or corrupt blob gives an empty body rather than failing the whole read
+    """
+    if not zdata:
+        return ""
+    try:
+        data = gzip.decompress(zdata)
+        for field_number in (2, 3, 2):
+            data = _protobuf_field(data, field_number)
+            if data is None:
+                return ""
+    except (OSError, EOFError, zlib.error, IndexError, ValueError):
+        return ""
+    # U+FFFC marks the position of attachments
+    return data.decode("utf-8", errors="replace").replace("\ufffc", "")
+
+
+def _format_note_date(dt):
+    """
+    Format a local datetime like AppleScript's date-to-text coercion
+    (e.g. "Tuesday, June 10, 2025 at 10:15:32 AM")
+    """
+    hour = dt.hour % 12 or 12
+    return f"{dt:%A, %B} {dt.day}, {dt.year} at {hour}:{dt:%M:%S %p}"
+
+
+def _format_core_data_date(timestamp):
+    """
+    Format a Core Data timestamp of the Notes store
+    """
+    if timestamp is None:
+        return ""
+    return _format_note_date(datetime.fromtimestamp(timestamp + CORE_DATA_EPOCH))
+
+
+def _format_iso_date(value):
+    """
+    Format an ISO 8601 UTC timestamp (as produced by JavaScript's toISOString) in local time
+    """
+    return _format_note_date(datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone())
+
+
+def _read_notes_sqlite(limit, from_date=None, to_date=None, preview=False):
+    """
+    Read the most recently modified notes straight from the Notes SQLite store
+    
+    Args:
+        limit: Maximum number of notes to return
+        from_date: Only return notes modified on or after this date
+        to_date: Only return notes modified up to this date
+        preview: Return the title and the snippet Notes stores for its list view
+            (up to PREVIEW_LENGTH characters) instead of decoding the full body
+    
+    Returns:
+        List of note dictionaries (plain-text bodies), or None if the store
+        cannot be read and the caller should fall back to AppleScript
+    """
+    # A single indexed query: unlike the scripted readers, this isn't worth caching
+    conn = _open_notes_db()
+    if conn is None:
+        return None
+    try:
+        sql, params, (title_col, created_col, modified_col, snippet_col) = _notes_query_parts(conn, from_date, to_date)
+        order = f"ORDER BY n.{modified_col} DESC LIMIT ?"
+        preview = preview and snippet_col is not None
+        
+        content_col = f"n.{snippet_col}" if preview else "d.ZDATA"
+        rows = conn.execute(
+            f"SELECT n.{title_col}, {content_col}, n.{created_col}, n.{modified_col}, n.Z_PK {sql} {order}",
+            params + [limit]
+        ).fetchall()
+        # AppleScript note ids are Core Data URIs built from the store UUID and the row key
+        store_uuid = conn.execute("SELECT Z_UUID FROM Z_METADATA").fetchone()[0]
+        notes = [
+            {
+                "title": title.strip(),
+                "body": (f"{title}\n{content or ''}"[:PREVIEW_LENGTH] if preview
+                         else _decode_note_body(content)).strip(),
+                "created": _format_core_data_date(created),
+                "modified": _format_core_data_date(modified),
+                "id": f"x-coredata://{store_uuid}/ICNote/p{pk}"
+            }
+            for title, content, created, modified, pk in rows
+        ]
+        return notes
+    except (sqlite3.Error, StopIteration, OSError, IndexError) as e:
+        print(f"Could not read the Notes database ({e}), falling back to AppleScript")
+        return None
+    finally:
+        conn.close()
+
+
+def _count_notes_sqlite(from_date=None, to_date=None):
+    """
+    Count notes in the Notes SQLite store, optionally within a modification date range
+    Returns the count, or None if the store cannot be read
+    """
+    conn = _open_notes_db()
+    if conn is None:
+        return None
+    try:
+        sql, params, _ = _notes_query_parts(conn, from_date, to_date)
+        return conn.execute(f"SELECT COUNT(*) {sql}", params).fetchone()[0]
+    except (sqlite3.Error, StopIteration) as e:
+        print(f"Could not read the Notes database ({e}), falling back to AppleScript")
+        return None
+    finally:
+        conn.close()
+
+
+# JXA fetches a property of every note in ONE Apple event (notes.name() returns an
+# array), where AppleScript's "name of n" in a repeat loop costs one event per note
+# The modification dates double as a fingerprint: when they and the total note count
+# match the value cached by a previous run, the script returns early without fetching
+# any note content (the total is part of the cached result, so it has to match too)
+_JXA_NOTES_SCRIPT = """
+function run(argv) {
+const params = JSON.parse(argv[0]);
+const notes = Application("Notes").notes;
+// Notes evaluates a date predicate itself, so only the notes within it are sent back. Compound
+// whose clauses are far slower in Notes, so with both dates the upper one is checked here instead
+const upperOp = params.upperInclusive ? "_lessThanEquals" : "_lessThan";
+let scope = notes;
+let checkUpper = false;
+if (params.lower !== null) {
+    scope = notes.whose({modificationDate: {_greaterThanEquals: new Date(params.lower)}});
+    checkUpper = params.upper !== null;
+} else if (params.upper !== null) {
+    scope = notes.whose({modificationDate: {[upperOp]: new Date(params.upper)}});
+}
+const total = notes.length;
+if (params.limit === 0 && !checkUpper) {
+    return JSON.stringify({fingerprint: null, total: total, count: scope.length, notes: []});
+}
+const modified = scope.modificationDate();
+const times = modified.map(d => d.getTime());
+const matching = [];
+for (let i = 0; i < times.length; i++) {
+    if (checkUpper && (params.upperInclusive ? times[i] > params.upper : times[i] >= params.upper)) continue;
+    matching.push(i);
+}
+if (params.limit === 0) {
+    return JSON.stringify({fingerprint: null, total: total, count: matching.length, notes: []});
+}
+// cyrb53 string hash
+const text = times.join(",");
+let h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+for (let i = 0; i < text.length; i++) {
+    const c = text.charCodeAt(i);
+    h1 = Math.imul(h1 ^ c, 2654435761);
+    h2 = Math.imul(h2 ^ c, 1597334677);
+}
+h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+const fingerprint = total + "-" + times.length + "-" + (4294967296 * (2097151 & h2) + (h1 >>> 0));
+if (fingerprint === params.known) return JSON.stringify({fingerprint: fingerprint, unchanged: true});
+
+// The collection isn't guaranteed to be newest first, so the latest notes are picked
+// from the timestamps already fetched and only their bodies are read
+matching.sort((a, b) => times[b] - times[a]);
+const selected = matching.slice(0, params.limit);
+const result = {fingerprint: fingerprint, total: total, count: matching.length, notes: []};
+if (selected.length > 0) {
+    const names = scope.name();
+    const created = scope.creationDate();
+    const ids = scope.id();
+    // JavaScript has no casefold(): uppercasing then lowercasing (and folding the ß that leaves)
+    // folds the same as Python wherever the result is ASCII, so only ASCII tags are checked here
+    // and the others are left to the Python filter
+    const tag = params.tag !== null && /^[\\x00-\\x7f]*$/.test(params.tag) ? params.tag : null;
+    for (const i of selected) {
+        try {
+            const body = params.preview ? scope[i].plaintext().slice(0, params.preview) : scope[i].body();
+            // Notes that would be filtered out in Python aren't sent back at all
+            const content = (names[i] + "\\u0000" + body).toUpperCase().toLowerCase().replace(/\\u00df/g, "ss");
+            if (params.marker !== null && content.includes(params.marker)) continue;
+            if (tag !== null && !content.includes(tag)) continue;
+            result.notes.push({title: names[i], body: body, created: created[i].toISOString(),
+                               modified: modified[i].toISOString(), id: ids[i]});
+        } catch (e) {
+            // Skip notes that can't be read
+        }
+    }
+}
+return JSON.stringify(result);
+}
+"""
+
+
+# Set to False to skip the Scripting Bridge and always fall back to osascript
+USE_SCRIPTING_BRIDGE = True
+
+
+def _read_notes_bridge(params):
+    """
+    Query the notes of every account in-process through PyObjC's Scripting Bridge
+    
+    Args:
+        params: Query parameters of _JXA_NOTES_SCRIPT
+    
+    Returns:
+        dict shaped like the output of _JXA_NOTES_SCRIPT, or None if the bridge is unavailable or fails
+    """
+    if SBApplication is None or not USE_SCRIPTING_BRIDGE:
+        return None
+    try:
+        notes = SBApplication.applicationWithBundleIdentifier_("com.apple.Notes").notes()
+        total = notes.count()
+        # The predicate becomes a whose clause, so only the notes within it are sent back; like in
+        # the JXA script, a single date is sent and with both dates the upper one is checked here
+        lower, upper = params["lower"], params["upper"]
+        upper_format = "modificationDate <= %@" if params["upperInclusive"] else "modificationDate < %@"
+        check_upper = lower is not None and upper is not None
+        if lower is not None:
+            notes = notes.filteredArrayUsingPredicate_(NSPredicate.predicateWithFormat_argumentArray_(
+                "modificationDate >= %@", [NSDate.dateWithTimeIntervalSince1970_(lower / 1000)]))
+        elif upper is not None:
+            notes = notes.filteredArrayUsingPredicate_(NSPredicate.predicateWithFormat_argumentArray_(
+                upper_format, [NSDate.dateWithTimeIntervalSince1970_(upper / 1000)]))
+        if params["limit"] == 0 and not check_upper:
+            return {"fingerprint": None, "total": total, "count": notes.count(), "notes": []}
+        
+        # arrayByApplyingSelector_ fetches one property of every note with a single Apple event
+        modified = notes.arrayByApplyingSelector_("modificationDate")
+        times = [d.timeIntervalSince1970() * 1000 for d in modified]
+        matching = [i for i, t in enumerate(times)
+                    if not check_upper or (t <= upper if params["upperInclusive"] else t < upper)]
+        if params["limit"] == 0:
+            return {"fingerprint": None, "total": total, "count": len(matching), "notes": []}
+        
+        digest = hashlib.sha1(",".join(map(repr, times)).encode()).hexdigest()
+        fingerprint = f"sb-{total}-{len(times)}-{digest}"
+        if fingerprint == params["known"]:
+            return {"fingerprint": fingerprint, "unchanged": True}
+        
+        matching.sort(key=times.__getitem__, reverse=True)
+        selected = matching[:params["limit"]]
+        result = {"fingerprint": fingerprint, "total": total, "count": len(matching), "notes": []}
+        if not selected:
+            return result
+        
+        names = notes.arrayByApplyingSelector_("name")
+        created = notes.arrayByApplyingSelector_("creationDate")
+        ids = notes.arrayByApplyingSelector_("id")
+        for i in selected:
+            note = notes.objectAtIndex_(i)
+            body = note.plaintext()[:params["preview"]] if params["preview"] else note.body()
+            # Notes that would be filtered out in Python aren't kept at all
+            # Folded like apply_marker_and_tag_filters, so no note it would keep is dropped here
+            content = f"{names[i]}\x00{body}".casefold()
+            if params["marker"] is not None and params["marker"] in content:
+                continue
+            if params["tag"] is not None and params["tag"] not in content:
+                continue
+            result["notes"].append({
+                "title": str(names[i]),
+                "body": str(body),
+                "created": datetime.fromtimestamp(created[i].timeIntervalSince1970(), timezone.utc).isoformat(),
+                "modified": datetime.fromtimestamp(times[i] / 1000, timezone.utc).isoformat(),
+                "id": str(ids[i]),
+            })
+        return result
+    except Exception as e:
+        print(f"⚠️  Scripting Bridge query failed, falling back to osascript: {e}")
+        return None
+
+
+def _run_jxa_notes(limit=0, from_date=None, to_date=None, timeout=60, preview=False,
+                   filter_tag=None, skip_marked=True):
+    """
+    Query the notes of every account through the Scripting Bridge or JXA (fallbacks of the SQLite reader)
+    
+    Args:
+        limit: Maximum number of notes to return (0 to only count)
+        from_date: Only count and return notes modified on or after this day (from 00:00:00)
+        to_date: Only count and return notes modified up to this day (until 23:59:59)
+        timeout: Seconds to wait for osascript
+        preview: Return the first PREVIEW_LENGTH characters of the plain text instead of the HTML body
+        filter_tag: Drop the notes without this string (case-insensitive) among the latest limit ones
+        skip_marked: Drop the notes containing the voyeur marker among the latest limit ones
+    
+    Returns:
+        dict with 'total' (all notes), 'count' (notes within the dates) and 'notes'
+        (up to limit note dictionaries), or None on error
+    """
+    params = {"limit": limit, "lower": None, "upper": None, "upperInclusive": from_date is not None,
+              "preview": PREVIEW_LENGTH if preview else 0,
+              "tag": filter_tag.casefold() if filter_tag else None,
+              "marker": _VOYEUR_MARKER_FOLDED if skip_marked else None}
+    if from_date is not None:
+        params["lower"] = datetime(from_date.year, from_date.month, from_date.day).timestamp() * 1000
+    if to_date is not None:
+        params["upper"] = datetime(to_date.year, to_date.month, to_date.day, 23, 59, 59).timestamp() * 1000
+    key = "jxa|" + json.dumps(params, sort_keys=True)
+    # Counting returns no notes, so it is never cached
+    if limit:
+        cached = _cached_notes(key)
+        if cached is not None:
+            return cached
+    params["known"] = _load_notes_cache().get(key, {}).get("fingerprint") if limit else None
+    
+    data = _read_notes_bridge(params)
+    if data is None:
+        output = _osascript_output(_JXA_NOTES_SCRIPT, [json.dumps(params)], language="JavaScript", timeout=timeout)
+        if output is None:
+            return None
+        try:
+            data = json.loads(output)
+        except ValueError as e:
+            print(f"Unexpected JavaScript output: {e}")
+            return None
+    
+    if data.get("unchanged"):
+        cached = _cached_notes(key, data["fingerprint"])
+        if cached is not None:
+            return cached
+        # The cache was rewritten meanwhile, read again without the fingerprint shortcut
+        _store_notes_cache(key, None, None)
+        return _run_jxa_notes(limit, from_date, to_date, timeout, preview, filter_tag, skip_marked)
+    
+    for note in data["notes"]:
+        note["title"] = note["title"].strip()
+        note["body"] = note["body"].strip()
+        note["created"] = _format_iso_date(note["created"])
+        note["modified"] = _format_iso_date(note["modified"])
+    fingerprint = data.pop("fingerprint")
+    if fingerprint is not None:
+        _store_notes_cache(key, fingerprint, data)
+    return data
+
+
+def _read_latest_notes(limit, timeout=30):
+    """
+    Read the latest notes, marked ones included, from SQLite or else through JXA
+    
+    Args:
+        limit: Maximum number of notes to return
+        timeout: Seconds allowed for the JXA fallback
+    
+    Returns:
+        List of note dictionaries, or None if Notes couldn't be read
+    """
+    notes = _read_notes_sqlite(limit)
+    if notes is not None:
+        return notes
+    # Only the newest notes' bodies are fetched, instead of walking the notes in list order
+    data = _run_jxa_notes(limit, timeout=timeout, skip_marked=False)
+    return data["notes"] if data is not None else None
+
+
+def read_all_notes(limit=10):
+    """
+    Reads the latest notes from macOS Notes app
+    Returns a string with note information
+    """
+    notes = _read_latest_notes(limit)
+    if notes is None:
+        return None
+    return _format_notes_simple(notes)
 
 
-def read_notes_with_filters(limit=5, from_date=None, to_date=None, filter_tag=None):
+def _format_notes_simple(notes):
+    """
+    Format notes as "title -> body" lines, the output of read_all_notes
+    """
+    return "".join(f"{note['title']} -> {note['body']}\n" for note in notes)
+
+
+def apply_marker_and_tag_filters(notes, filter_tag=None):
+    """
+    Drop notes already marked by note voyeur and, if given, notes without filter_tag
+    
+    Args:
+        notes: List of note dictionaries with 'title' and 'body' keys
+        filter_tag: Only keep notes containing this string in title or body (case-insensitive)
+    
+    Returns:
+        List of the notes to extract
+    """
+    marker = _VOYEUR_MARKER_FOLDED
+    tag = filter_tag.casefold() if filter_tag else None
+    
+    filtered_notes = []
+    for note in notes:
+        # Title and body are folded once each; folding them separately avoids first copying
+        # the whole body into a joined string
+        title = note['title'].casefold()
+        body = note['body'].casefold()
+        
+        # Rule 1: If note contains marker, IGNORE it always
+        if marker in title or marker in body:
+            continue
+        
+        # Rule 2: If filter-tag is specified, the note must contain it in title or body
+        if tag and tag not in title and tag not in body:
+            continue
+        
+        filtered_notes.append(note)
+    
+    return filtered_notes
+
+
+def read_notes_with_filters(limit=5, from_date=None, to_date=None, filter_tag=None, preview=False):
     """
     Reads notes from macOS Notes app with date and limit filters
     Returns individual note data filtered by date and limited by count
@@ -53,326 +969,59 @@ def read_notes_with_filters(limit=5, from_date=None, to_date=None, filter_tag=No
         from_date: Only return notes modified on or after this date (forward filtering)
         to_date: Only return notes modified before this date (reverse filtering)
         filter_tag: Only return notes containing this string in title or body (case-insensitive)
+        preview: Only read the beginning of each note's text (the tag is then matched on it)
     """
     # If no dates specified, use current date minus 30 days as reasonable default
     if from_date is None and to_date is None:
         from_date = datetime.now() - timedelta(days=30)
     
-    # AppleScript with dynamic filtering
-    if from_date is not None and to_date is not None:
-        # Range filtering script
-        script = f'''
-        tell application "Notes"
-            set noteData to {{}}
-            set noteCount to 0
-            set processedCount to 0
-            
-            repeat with n in notes of default account
-                set processedCount to processedCount + 1
-                
-                try
-                    set fromFilterDate to current date
-                    set day of fromFilterDate to {from_date.day}
-                    set month of fromFilterDate to {from_date.month}
-                    set year of fromFilterDate to {from_date.year}
-                    set hours of fromFilterDate to 0
-                    set minutes of fromFilterDate to 0
-                    set seconds of fromFilterDate to 0
-                    
-                    set toFilterDate to current date
-                    set day of toFilterDate to {to_date.day}
-                    set month of toFilterDate to {to_date.month}
-                    set year of toFilterDate to {to_date.year}
-                    set hours of toFilterDate to 23
-                    set minutes of toFilterDate to 59
-                    set seconds of toFilterDate to 59
-                    
-                    set noteModDate to modification date of n
-                    if noteModDate ≥ fromFilterDate and noteModDate ≤ toFilterDate then
-                        set noteCount to noteCount + 1
-                        if noteCount > {limit} then exit repeat
-                        set noteInfo to (name of n) & "|" & (body of n) & "|" & (creation date of n) & "|" & (modification date of n)
-                        set end of noteData to noteInfo
-                    end if
-                on error
-                    -- Skip notes that can't be read
-                end try
-                
-                -- Limit processing to avoid timeout (check only first 500 notes)
-                if processedCount > 500 then exit repeat
-            end repeat
-            
-            set AppleScript's text item delimiters to "~~~"
-            set noteDataString to noteData as string
-            set AppleScript's text item delimiters to ""
-            return noteDataString
-        end tell
-        '''
-    elif from_date is not None:
-        # Forward filtering script
-        script = f'''
-        tell application "Notes"
-            set noteData to {{}}
-            set noteCount to 0
-            set processedCount to 0
-            
-            repeat with n in notes of default account
-                set processedCount to processedCount + 1
-                
-                try
-                    set filterDate to current date
-                    set day of filterDate to {from_date.day}
-                    set month of filterDate to {from_date.month}
-                    set year of filterDate to {from_date.year}
-                    set hours of filterDate to 0
-                    set minutes of filterDate to 0
-                    set seconds of filterDate to 0
-                    
-                    set noteModDate to modification date of n
-                    if noteModDate ≥ filterDate then
-                        set noteCount to noteCount + 1
-                        if noteCount > {limit} then exit repeat
-                        set noteInfo to (name of n) & "|" & (body of n) & "|" & (creation date of n) & "|" & (modification date of n)
-                        set end of noteData to noteInfo
-                    end if
-                on error
-                    -- Skip notes that can't be read
-                end try
-                
-                -- Limit processing to avoid timeout (check only first 500 notes)
-                if processedCount > 500 then exit repeat
-            end repeat
-            
-            set AppleScript's text item delimiters to "~~~"
-            set noteDataString to noteData as string
-            set AppleScript's text item delimiters to ""
-            return noteDataString
-        end tell
-        '''
-    elif to_date is not None:
-        # Reverse filtering script
-        script = f'''
-        tell application "Notes"
-            set noteData to {{}}
-            set noteCount to 0
-            set processedCount to 0
-            
-            repeat with n in notes of default account
-                set processedCount to processedCount + 1
-                
-                try
-                    set filterDate to current date
-                    set day of filterDate to {to_date.day}
-                    set month of filterDate to {to_date.month}
-                    set year of filterDate to {to_date.year}
-                    set hours of filterDate to 23
-                    set minutes of filterDate to 59
-                    set seconds of filterDate to 59
-                    
-                    set noteModDate to modification date of n
-                    if noteModDate < filterDate then
-                        set noteCount to noteCount + 1
-                        if noteCount > {limit} then exit repeat
-                        set noteInfo to (name of n) & "|" & (body of n) & "|" & (creation date of n) & "|" & (modification date of n)
-                        set end of noteData to noteInfo
-                    end if
-                on error
-                    -- Skip notes that can't be read
-                end try
-                
-                -- Limit processing to avoid timeout (check only first 500 notes)
-                if processedCount > 500 then exit repeat
-            end repeat
-            
-            set AppleScript's text item delimiters to "~~~"
-            set noteDataString to noteData as string
-            set AppleScript's text item delimiters to ""
-            return noteDataString
-        end tell
-        '''
-    else:
-        # No date filtering script
-        script = f'''
-        tell application "Notes"
-            set noteData to {{}}
-            set noteCount to 0
-            set processedCount to 0
-            
-            repeat with n in notes of default account
-                set processedCount to processedCount + 1
-                
-                try
-                    set noteCount to noteCount + 1
-                    if noteCount > {limit} then exit repeat
-                    set noteInfo to (name of n) & "|" & (body of n) & "|" & (creation date of n) & "|" & (modification date of n)
-                    set end of noteData to noteInfo
-                on error
-                    -- Skip notes that can't be read
-                end try
-                
-                -- Limit processing to avoid timeout (check only first 500 notes)
-                if processedCount > 500 then exit repeat
-            end repeat
-            
-            set AppleScript's text item delimiters to "~~~"
-            set noteDataString to noteData as string
-            set AppleScript's text item delimiters to ""
-            return noteDataString
-        end tell
-        '''
+    # Fast path: query the Notes database directly
+    notes = _read_notes_sqlite(limit, from_date, to_date, preview)
+    if notes is not None:
+        return apply_marker_and_tag_filters(notes, filter_tag)
     
-    try:
-        result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True, timeout=60)
-        if result.returncode == 0:
-            notes = []
-            note_strings = result.stdout.strip().split("~~~")
-            
-            for note_string in note_strings:
-                if note_string.strip():
-                    parts = note_string.split("|", 3)
-                    if len(parts) >= 4:
-                        note = {
-                            "title": parts[0].strip(),
-                            "body": parts[1].strip(),
-                            "created": parts[2].strip(),
-                            "modified": parts[3].strip()
-                        }
-                        notes.append(note)
-            
-            # Apply marker and tag filtering logic
-            marker = "NOTE-VOYEUR: TARGET ACQUIRED!"
-            
-            # Apply tag filter if specified
-            if filter_tag:
-                filtered_notes = []
-                for note in notes:
-                    title_content = note["title"]
-                    body_content = note["body"]
-                    
-                    # Rule 1: If note contains marker, IGNORE it always
-                    if marker in title_content or marker in body_content:
-                        continue
-                    
-                    # Rule 2: If note does NOT contain marker and filter-tag is specified
-                    # Check if filter-tag exists in title or body
-                    if filter_tag in title_content or filter_tag in body_content:
-                        filtered_notes.append(note)
-                
-                notes = filtered_notes
-            else:
-                # No filter-tag specified, but still need to exclude notes with marker
-                filtered_notes = []
-                for note in notes:
-                    title_content = note["title"]
-                    body_content = note["body"]
-                    
-                    # Rule 1: If note contains marker, IGNORE it always
-                    if marker in title_content or marker in body_content:
-                        continue
-                    
-                    # Rule 2: If note does NOT contain marker, use it
-                    filtered_notes.append(note)
-                
-                notes = filtered_notes
-            
-            return notes
-        else:
-            print(f"Error executing AppleScript: {result.stderr}")
-            return []
-    except subprocess.TimeoutExpired:
-        print("AppleScript execution timed out after 60 seconds")
-        return []
-    except Exception as e:
-        print(f"Error running subprocess: {e}")
+    result = _run_jxa_notes(limit, from_date, to_date, preview=preview, filter_tag=filter_tag)
+    if result is None:
         return []
+    return apply_marker_and_tag_filters(result["notes"], filter_tag)
 
 
-def read_notes_structured(limit=10):
+def read_notes_structured(limit=10, preview=False):
     """
     Reads notes in a more structured way, returning individual note data
     Original function for backward compatibility
+    Only the beginning of each note's text is read when preview is True
     """
-    script = f'''
-    tell application "Notes"
-        set noteData to {{}}
-        set noteCount to 0
-        repeat with n in notes of default account
-            set noteCount to noteCount + 1
-            if noteCount > {limit} then exit repeat
-            set noteInfo to (name of n) & "|" & (body of n) & "|" & (creation date of n) & "|" & (modification date of n)
-            set end of noteData to noteInfo
-        end repeat
-        set AppleScript's text item delimiters to "~~~"
-        set noteDataString to noteData as string
-        set AppleScript's text item delimiters to ""
-        return noteDataString
-    end tell
-    '''
+    notes = _read_notes_sqlite(limit, preview=preview)
+    if notes is not None:
+        return apply_marker_and_tag_filters(notes)
     
-    try:
-        result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True, timeout=30)
-        if result.returncode == 0:
-            notes = []
-            note_strings = result.stdout.strip().split("~~~")
-            
-            for note_string in note_strings:
-                if note_string.strip():
-                    parts = note_string.split("|", 3)
-                    if len(parts) >= 4:
-                        note = {
-                            "title": parts[0].strip(),
-                            "body": parts[1].strip(),
-                            "created": parts[2].strip(),
-                            "modified": parts[3].strip()
-                        }
-                        notes.append(note)
-            
-            # Apply marker filtering logic (exclude notes with marker)
-            marker = "NOTE-VOYEUR: TARGET ACQUIRED!"
-            filtered_notes = []
-            for note in notes:
-                title_content = note["title"]
-                body_content = note["body"]
-                
-                # If note contains marker, IGNORE it
-                if marker in title_content or marker in body_content:
-                    continue
-                
-                # If note does NOT contain marker, use it
-                filtered_notes.append(note)
-            
-            return filtered_notes
-        else:
-            print(f"Error executing AppleScript: {result.stderr}")
-            return []
-    except subprocess.TimeoutExpired:
-        print("AppleScript execution timed out after 30 seconds")
-        return []
-    except Exception as e:
-        print(f"Error running subprocess: {e}")
+    result = _run_jxa_notes(limit, timeout=30, preview=preview)
+    if result is None:
         return []
+    # Apply marker filtering logic (exclude notes with marker)
+    return apply_marker_and_tag_filters(result["notes"])
 
 
-def count_total_notes():
+def _count_notes(from_date=None, to_date=None, timeout=20):
     """
-    Count total number of notes in the Notes app
+    Count notes, within the modification dates if given, from SQLite or else through JXA
     """
-    script = '''
-    tell application "Notes"
-        return count of notes of default account
-    end tell
-    '''
+    count = _count_notes_sqlite(from_date, to_date)
+    if count is not None:
+        return count
     
-    try:
-        result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True, timeout=10)
-        if result.returncode == 0:
-            return int(result.stdout.strip())
-        else:
-            print(f"Error counting notes: {result.stderr}")
-            return 0
-    except Exception as e:
-        print(f"Error counting notes: {e}")
+    result = _run_jxa_notes(from_date=from_date, to_date=to_date, timeout=timeout)
+    if result is None:
         return 0
+    return result["count"] if from_date is not None or to_date is not None else result["total"]
+
+
+def count_total_notes():
+    """
+    Count total number of notes in the Notes app
+    """
+    return _count_notes(timeout=10)
 
 
 def count_notes_from_date(from_date):
@@ -381,49 +1030,7 @@ def count_notes_from_date(from_date):
     """
     if from_date is None:
         from_date = datetime.now() - timedelta(days=30)
-    
-    script = f'''
-    tell application "Notes"
-        set noteCount to 0
-        set processedCount to 0
-        
-        set filterDate to current date
-        set day of filterDate to {from_date.day}
-        set month of filterDate to {from_date.month}
-        set year of filterDate to {from_date.year}
-        set hours of filterDate to 0
-        set minutes of filterDate to 0
-        set seconds of filterDate to 0
-        
-        repeat with n in notes of default account
-            set processedCount to processedCount + 1
-            try
-                set noteModDate to modification date of n
-                if noteModDate ≥ filterDate then
-                    set noteCount to noteCount + 1
-                end if
-            on error
-                -- Skip notes that can't be read
-            end try
-            
-            -- Limit processing to avoid timeout (check only first 500 notes)
-            if processedCount > 500 then exit repeat
-        end repeat
-        
-        return noteCount
-    end tell
-    '''
-    
-    try:
-        result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True, timeout=20)
-        if result.returncode == 0:
-            return int(result.stdout.strip())
-        else:
-            print(f"Error counting notes from date: {result.stderr}")
-            return 0
-    except Exception as e:
-        print(f"Error counting notes from date: {e}")
-        return 0
+    return _count_notes(from_date=from_date)
 
 
 def count_notes_to_date(to_date):
@@ -432,49 +1039,7 @@ def count_notes_to_date(to_date):
     """
     if to_date is None:
         return 0
-    
-    script = f'''
-    tell application "Notes"
-        set noteCount to 0
-        set processedCount to 0
-        
-        set filterDate to current date
-        set day of filterDate to {to_date.day}
-        set month of filterDate to {to_date.month}
-        set year of filterDate to {to_date.year}
-        set hours of filterDate to 23
-        set minutes of filterDate to 59
-        set seconds of filterDate to 59
-        
-        repeat with n in notes of default account
-            set processedCount to processedCount + 1
-            try
-                set noteModDate to modification date of n
-                if noteModDate < filterDate then
-                    set noteCount to noteCount + 1
-                end if
-            on error
-                -- Skip notes that can't be read
-            end try
-            
-            -- Limit processing to avoid timeout (check only first 500 notes)
-            if processedCount > 500 then exit repeat
-        end repeat
-        
-        return noteCount
-    end tell
-    '''
-    
-    try:
-        result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True, timeout=20)
-        if result.returncode == 0:
-            return int(result.stdout.strip())
-        else:
-            print(f"Error counting notes to date: {result.stderr}")
-            return 0
-    except Exception as e:
-        print(f"Error counting notes to date: {e}")
-        return 0
+    return _count_notes(to_date=to_date)
 
 
 def count_notes_in_range(from_date, to_date):
@@ -483,94 +1048,129 @@ def count_notes_in_range(from_date, to_date):
     """
     if from_date is None or to_date is None:
         return 0
+    return _count_notes(from_date, to_date)
+
+
+def read_all_stats_and_notes(limit, from_date=None, to_date=None, filter_tag=None, include_notes=True,
+                             preview=False):
+    """
+    Count all notes, count the notes within the dates and read the notes to extract
+    in a single pass: three concurrent database queries, or ONE osascript run when
+    the JXA fallback is used
     
-    script = f'''
-    tell application "Notes"
-        set noteCount to 0
-        set processedCount to 0
-        
-        set fromFilterDate to current date
-        set day of fromFilterDate to {from_date.day}
-        set month of fromFilterDate to {from_date.month}
-        set year of fromFilterDate to {from_date.year}
-        set hours of fromFilterDate to 0
-        set minutes of fromFilterDate to 0
-        set seconds of fromFilterDate to 0
-        
-        set toFilterDate to current date
-        set day of toFilterDate to {to_date.day}
-        set month of toFilterDate to {to_date.month}
-        set year of toFilterDate to {to_date.year}
-        set hours of toFilterDate to 23
-        set minutes of toFilterDate to 59
-        set seconds of toFilterDate to 59
-        
-        repeat with n in notes of default account
-            set processedCount to processedCount + 1
-            try
-                set noteModDate to modification date of n
-                if noteModDate ≥ fromFilterDate and noteModDate ≤ toFilterDate then
-                    set noteCount to noteCount + 1
-                end if
-            on error
-                -- Skip notes that can't be read
-            end try
-            
-            -- Limit processing to avoid timeout (check only first 500 notes)
-            if processedCount > 500 then exit repeat
-        end repeat
-        
-        return noteCount
-    end tell
-    '''
+    Args:
+        limit: Maximum number of notes to return
+        from_date: Only count and return notes modified on or after this date
+        to_date: Only count and return notes modified up to this date
+        filter_tag: Only return notes containing this string in title or body
+        include_notes: Also read the notes (False for statistics only)
+        preview: Only read the beginning of each note's text
     
-    try:
-        result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True, timeout=20)
-        if result.returncode == 0:
-            return int(result.stdout.strip())
-        else:
-            print(f"Error counting notes in range: {result.stderr}")
-            return 0
-    except Exception as e:
-        print(f"Error counting notes in range: {e}")
-        return 0
+    Returns:
+        tuple: (total count, count within the dates or None when no date is given,
+                list of notes or None when include_notes is False)
+    """
+    dated = from_date is not None or to_date is not None
+    # Same selection as read_notes_with_filters / read_notes_structured
+    read_from = from_date
+    if filter_tag and not dated:
+        read_from = datetime.now() - timedelta(days=30)
+    
+    if os.path.exists(NOTES_DB_PATH):
+        # Each query opens its own read-only connection, so they can run side by side
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            total_future = executor.submit(_count_notes_sqlite)
+            count_future = executor.submit(_count_notes_sqlite, from_date, to_date) if dated else None
+            notes_future = executor.submit(_read_notes_sqlite, limit, read_from, to_date, preview) if include_notes else None
+            total = total_future.result()
+            filtered_count = count_future.result() if count_future else None
+            notes = notes_future.result() if notes_future else None
+        if total is not None and (notes is not None or not include_notes):
+            if notes is not None:
+                notes = apply_marker_and_tag_filters(notes, filter_tag)
+            return total, filtered_count, notes
+    
+    # One JXA run returns both counts and the notes
+    result = _run_jxa_notes(limit if include_notes else 0, read_from, to_date, timeout=90, preview=preview,
+                            filter_tag=filter_tag)
+    if result is None:
+        return 0, 0 if dated else None, [] if include_notes else None
+    
+    filtered_count = result["count"] if dated else None
+    notes = None
+    if include_notes:
+        notes = apply_marker_and_tag_filters(result["notes"], filter_tag)
+    return result["total"], filtered_count, notes
+
 
+# Date formats accepted by parse_date_string, classified without strptime attempts
+_DAYS_AGO_RE = re.compile(r"\s*[+-]?\d+\s*")
+_ISO_DATE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_SLASH_DATE_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
 
-def parse_date_string(date_str):
+
+@lru_cache(maxsize=64)
+def _parse_calendar_date(date_str):
+    """
+    Parse an absolute date (YYYY-MM-DD, DD/MM/YYYY or MM/DD/YYYY), None if invalid
+    """
+    match = _ISO_DATE_RE.fullmatch(date_str)
+    if match:
+        year, month, day = map(int, match.groups())
+        candidates = [(year, month, day)]
+    else:
+        match = _SLASH_DATE_RE.fullmatch(date_str)
+        if not match:
+            return None
+        first, second, year = map(int, match.groups())
+        # Day first, month first only when that is not a valid date
+        candidates = [(year, second, first), (year, first, second)]
+    
+    for year, month, day in candidates:
+        try:
+            return datetime(year, month, day)
+        except ValueError:
+            pass
+    return None
+
+
+_DATE_FORMATS_HELP = "Use formats: YYYY-MM-DD, DD/MM/YYYY, or number of days ago (e.g., '7')"
+
+
+def _parse_date(date_str, now=None):
+    """
+    Parse a date in any supported format, None if it is not valid
+    Relative days count back from now (the current time if not given)
+    """
+    # Relative days (e.g., "7" means 7 days ago) depend on now, so they are not cached
+    if _DAYS_AGO_RE.fullmatch(date_str):
+        return (now or datetime.now()) - timedelta(days=int(date_str))
+    return _parse_calendar_date(date_str)
+
+
+def parse_date_string(date_str, now=None):
     """
     Parse date string in various formats
     Supported formats: YYYY-MM-DD, DD/MM/YYYY, relative days (e.g., '7' for 7 days ago)
+    Relative days count back from now, which defaults to the current time
     """
     if not date_str:
         return None
     
-    # Try relative days (e.g., "7" means 7 days ago)
-    try:
-        days_ago = int(date_str)
-        return datetime.now() - timedelta(days=days_ago)
-    except ValueError:
-        pass
-    
-    # Try YYYY-MM-DD format
-    try:
-        return datetime.strptime(date_str, "%Y-%m-%d")
-    except ValueError:
-        pass
-    
-    # Try DD/MM/YYYY format
-    try:
-        return datetime.strptime(date_str, "%d/%m/%Y")
-    except ValueError:
-        pass
-    
-    # Try MM/DD/YYYY format
-    try:
-        return datetime.strptime(date_str, "%m/%d/%Y")
-    except ValueError:
-        pass
-    
-    print(f"Could not parse date '{date_str}'. Use formats: YYYY-MM-DD, DD/MM/YYYY, or number of days ago (e.g., '7')")
-    return None
+    parsed = _parse_date(date_str, now)
+    if parsed is None:
+        print(f"Could not parse date '{date_str}'. {_DATE_FORMATS_HELP}")
+    return parsed
+
+
+def _date_argument(date_str, now=None):
+    """
+    argparse type for date options: rejects invalid dates before any note is read
+    """
+    parsed = _parse_date(date_str, now)
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"could not parse date '{date_str}'. {_DATE_FORMATS_HELP}")
+    return parsed
 
 
 def display_notes(notes):
@@ -581,38 +1181,223 @@ def display_notes(notes):
         print("No notes found or error occurred.")
         return
     
-    print(f"\n{'='*60}")
-    print(f"FOUND {len(notes)} NOTES")
-    print(f"{'='*60}\n")
-    
+    # Build the whole listing and write it at once instead of printing line by line
+    lines = ["", "=" * 60, f"FOUND {len(notes)} NOTES", "=" * 60, ""]
     for i, note in enumerate(notes, 1):
-        print(f"NOTE #{i}")
-        print(f"Title: {note['title']}")
-        print(f"Created: {note['created']}")
-        print(f"Modified: {note['modified']}")
-        print(f"Content Preview: {note['body'][:100]}{'...' if len(note['body']) > 100 else ''}")
-        print("-" * 60)
+        lines.extend([
+            f"NOTE #{i}",
+            f"Title: {note['title']}",
+            f"Created: {note['created']}",
+            f"Modified: {note['modified']}",
+            f"Content Preview: {note['body'][:100]}{'...' if len(note['body']) > 100 else ''}",
+            "-" * 60
+        ])
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def save_notes_to_file(notes, filename="notes_export.json"):
     """
-    Save notes to a JSON file
+    Save notes to a JSON file, or a JSON Lines file (one note per line) if the filename ends
+    in .jsonl; either is zstd-compressed if the filename ends in .zst
     """
+    compress = filename.endswith(".zst")
+    jsonl = filename.endswith((".jsonl", ".jsonl.zst"))
+    if compress and zstandard is None:
+        print(f"Error saving notes: writing {filename} requires the zstandard package")
+        return
+    partial_file = filename + ".part"
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(notes, f, indent=2, ensure_ascii=False)
+        # Notes are serialized one at a time instead of building the whole document in memory;
+        # the output is the same as dumping the list with a 2-space indent. The export is written
+        # next to its destination and moved in place, so a failed run never leaves a truncated file
+        with open(partial_file, 'wb', buffering=1 << 20) as f:
+            out = zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(f, closefd=False) if compress else f
+            if jsonl:
+                for note in notes:
+                    out.write(_json_dumps(note) + b"\n")
+            else:
+                separator = b"[\n  "
+                for note in notes:
+                    out.write(separator)
+                    out.write(_json_dumps(note, indent=True).replace(b"\n", b"\n  "))
+                    separator = b",\n  "
+                out.write(b"[]" if separator == b"[\n  " else b"\n]")
+            if compress:
+                out.close()
+        os.replace(partial_file, filename)
         print(f"\nNotes saved to {filename}")
     except Exception as e:
         print(f"Error saving notes: {e}")
+        try:
+            os.remove(partial_file)
+        except OSError:
+            pass
+
+
+# Descriptive export filenames, by whether the from and to dates are given
+_EXPORT_FILENAMES = {
+    (True, True): "notes_export_{from_stamp}_to_{to_stamp}{tag}{mark}_limit_{limit}{extension}",
+    (True, False): "notes_export_from_{from_stamp}{tag}{mark}_limit_{limit}{extension}",
+    (False, True): "notes_export_before_{to_stamp}{tag}{mark}_limit_{limit}{extension}",
+    (False, False): "notes_export_last{tag}{mark}_{limit}{extension}",
+}
+
+
+def build_export_filename(args, from_date=None, to_date=None, filter_tag=None):
+    """
+    Choose the export filename of a run
+    
+    Args:
+        args: Parsed command line arguments (output, jsonl, mark and limit are used)
+        from_date: Start date of the extraction, if any
+        to_date: End date of the extraction, if any
+        filter_tag: Tag filter of the extraction, if any
+    
+    Returns:
+        The --output name with the export extension ensured (.zst exports are compressed),
+        or a descriptive name built from the filters
+    """
+    extension = '.jsonl' if args.jsonl else '.json'
+    if args.output:
+        if args.output.endswith((extension, extension + '.zst')):
+            return args.output
+        return args.output + extension
+    
+    return _EXPORT_FILENAMES[(from_date is not None, to_date is not None)].format(
+        from_stamp=from_date.strftime('%Y%m%d') if from_date else "",
+        to_stamp=to_date.strftime('%Y%m%d') if to_date else "",
+        tag=f"_tag_{filter_tag.replace(' ', '_')}" if filter_tag else "",
+        mark="_marked" if args.mark else "",
+        limit=args.limit,
+        extension=extension,
+    )
+
+
+# Finds a note by title (item 1 of argv) and prepends a header (item 2 of argv) to its body
+_MARK_NOTE_SCRIPT = '''
+on run argv
+    set targetTitle to item 1 of argv
+    set header to item 2 of argv
+    tell application "Notes"
+        set targetFound to false
+        repeat with n in notes
+            try
+                with timeout of 10 seconds
+                    if (name of n) as string is targetTitle then
+                        -- Update the note body with new title
+                        set body of n to header & (body of n)
+                        set targetFound to true
+                        exit repeat
+                    end if
+                end timeout
+            on error
+                -- Skip notes that can't be accessed
+            end try
+        end repeat
+        return targetFound as text
+    end tell
+end run
+'''
+
+# Seconds Notes gets to update one note in a batch before it is skipped
+MARK_NOTE_TIMEOUT = 10
+
+# Marks several notes in one run: argv holds the marker, the per-note timeout and then
+# id/title/header triples, and the result has one character per triple ("1" marked, "0" not
+# found, not writable or too slow to answer, so one stuck note doesn't use up the whole run's
+# timeout). Notes are opened by id; without an id, the names are fetched in a single Apple event
+# and searched locally. A note whose title already starts with the marker counts as marked, so a
+# retried batch never marks a note twice
+_MARK_NOTES_SCRIPT = '''
+on markNote(n, marker, header, noteTimeout)
+    tell application "Notes"
+        try
+            with timeout of noteTimeout seconds
+                if name of n does not start with marker then set body of n to header & (body of n)
+            end timeout
+            return "1"
+        on error
+            -- A timed out update can still go through: check the title again before giving up
+            try
+                delay 1
+                with timeout of noteTimeout seconds
+                    if name of n starts with marker then return "1"
+                end timeout
+            end try
+            return "0"
+        end try
+    end tell
+end markNote
+
+on run argv
+    set marker to item 1 of argv
+    set noteTimeout to (item 2 of argv) as integer
+    set results to ""
+    tell application "Notes"
+        set allNotes to missing value
+        repeat with k from 3 to (count of argv) by 3
+            set targetId to item k of argv
+            set targetTitle to item (k + 1) of argv
+            set header to item (k + 2) of argv
+            set targetFound to "0"
+            if targetId is not "" then
+                try
+                    set targetFound to my markNote(note id targetId, marker, header, noteTimeout)
+                end try
+            else
+                if allNotes is missing value then
+                    set allNotes to notes
+                    set noteNames to name of notes
+                end if
+                repeat with i from 1 to (count of noteNames)
+                    if item i of noteNames is targetTitle then
+                        -- A note is marked once even if several targets share its title
+                        set item i of noteNames to missing value
+                        set targetFound to my markNote(item i of allNotes, marker, header, noteTimeout)
+                        exit repeat
+                    end if
+                end repeat
+            end if
+            set results to results & targetFound
+        end repeat
+    end tell
+    return results
+end run
+'''
+
+
+def _mark_notes_batch(targets):
+    """
+    Prepend headers to several notes found by id (or by title without one), with one osascript run
+    
+    Args:
+        targets: List of (id, title, header) tuples, id being '' when unknown
+    
+    Returns:
+        List of booleans telling which targets were marked, or None if the batch failed
+    """
+    args = [VOYEUR_MARKER, MARK_NOTE_TIMEOUT] + [value for target in targets for value in target]
+    # Each note may take the update timeout, a second and the title check timeout
+    timeout = 30 + (2 * MARK_NOTE_TIMEOUT + 1) * len(targets)
+    output = _osascript_output(_MARK_NOTES_SCRIPT, args, timeout=timeout)
+    if output is None:
+        return None
+    results = output.strip()
+    if len(results) != len(targets) or set(results) - {"0", "1"}:
+        print(f"Unexpected output from the marking script: {results[:100]}")
+        return None
+    return [result == "1" for result in results]
 
 
-def mark_notes_with_voyeur_tag(notes):
+def mark_notes_with_voyeur_tag(notes, before_report=None):
     """
     Mark notes by adding 'NOTE-VOYEUR: TARGET ACQUIRED!' to their title
     Modifies the note body to include the new title as the first line
     
     Args:
         notes: List of note dictionaries to mark
+        before_report: Called once Notes has been updated, before anything is printed
+            (main waits there for the export written meanwhile)
     
     Returns:
         int: Number of notes successfully marked
@@ -622,69 +1407,48 @@ def mark_notes_with_voyeur_tag(notes):
         return 0
     
     marked_count = 0
-    mark_prefix = "NOTE-VOYEUR: TARGET ACQUIRED!"
+    mark_prefix = VOYEUR_MARKER
+    
+    # Notes already marked are skipped, all the others are marked at once
+    pending = []
+    for i, note in enumerate(notes, 1):
+        if note['title'].startswith(mark_prefix):
+            continue
+        new_title = f"{mark_prefix} {note['title']}"
+        # The heading is prepended to the note's current HTML body inside Notes, since the
+        # extracted body may be plain text (SQLite reader) and would lose its formatting
+        header = f"<div><h1>{new_title}</h1></div>\n<div><br></div>\n"
+        pending.append((i, note, new_title, header))
+    
+    targets = [(note.get('id', ''), note['title'], header) for _, note, _, header in pending]
+    results = _mark_notes_batch(targets) if pending else []
+    if results is None:
+        # Marked notes get a new title, so retrying note by note can't mark any of them twice
+        results = []
+        for _, note, _, header in pending:
+            output = _osascript_output(_MARK_NOTE_SCRIPT, [note['title'], header])
+            results.append(output is not None and output.strip().lower() == "true")
     
+    if before_report is not None:
+        before_report()
     print(f"\n🎯 MARKING {len(notes)} NOTES WITH VOYEUR TAG...")
     print("=" * 60)
     
+    outcomes = {i: (new_title, header, marked) for (i, _, new_title, header), marked in zip(pending, results)}
     for i, note in enumerate(notes, 1):
-        try:
-            # Check if note is already marked
-            if note['title'].startswith(mark_prefix):
-                print(f"Note #{i}: '{note['title'][:50]}...' - ALREADY MARKED, skipping")
-                continue
-            
-            # Create new title with mark prefix
-            original_title = note['title']
-            new_title = f"{mark_prefix} {original_title}"
-            
-            # Get the original body content
-            original_body = note['body']
-            
-            # Create new body with the new title as first line
-            # The Notes app uses HTML format, so we create proper HTML structure
-            new_body = f"<div><h1>{new_title}</h1></div>\n<div><br></div>\n{original_body}"
-            
-            # AppleScript to modify the note
-            # We need to find the note by title and modification date to ensure we get the right one
-            escaped_title = original_title.replace('"', '\\"')
-            escaped_body = new_body.replace('"', '\\"').replace('\n', '\\n')
-            
-            script = f'''
-            tell application "Notes"
-                set targetFound to false
-                repeat with n in notes of default account
-                    try
-                        if (name of n) as string is "{escaped_title}" then
-                            -- Update the note body with new title
-                            set body of n to "{escaped_body}"
-                            set targetFound to true
-                            exit repeat
-                        end if
-                    on error
-                        -- Skip notes that can't be accessed
-                    end try
-                end repeat
-                return targetFound
-            end tell
-            '''
-            
-            # Execute the marking script
-            result = subprocess.run(["osascript", "-e", script], capture_output=True, text=True, timeout=30)
-            
-            if result.returncode == 0 and result.stdout.strip().lower() == "true":
-                marked_count += 1
-                print(f"✅ Note #{i}: '{original_title[:50]}...' - MARKED SUCCESSFULLY")
-                # Update the note object for display purposes
-                note['title'] = new_title
-                note['body'] = new_body
-            else:
-                print(f"❌ Note #{i}: '{original_title[:50]}...' - MARKING FAILED")
-                if result.stderr:
-                    print(f"   Error: {result.stderr.strip()}")
-                    
-        except Exception as e:
-            print(f"❌ Note #{i}: Error marking note - {e}")
+        if i not in outcomes:
+            print(f"Note #{i}: '{note['title'][:50]}...' - ALREADY MARKED, skipping")
+            continue
+        new_title, header, marked = outcomes[i]
+        original_title = note['title']
+        if marked:
+            marked_count += 1
+            print(f"✅ Note #{i}: '{original_title[:50]}...' - MARKED SUCCESSFULLY")
+            # Update the note object for display purposes
+            note['title'] = new_title
+            note['body'] = header + note['body']
+        else:
+            print(f"❌ Note #{i}: '{original_title[:50]}...' - MARKING FAILED")
     
     print("=" * 60)
     print(f"🎯 MARKING COMPLETED: {marked_count}/{len(notes)} notes marked successfully")
@@ -692,6 +1456,18 @@ def mark_notes_with_voyeur_tag(notes):
     return marked_count
 
 
+@lru_cache(maxsize=8)
+def _marks_pattern(filter_tag=None):
+    """
+    Compiled regex matching the voyeur marker and, if given, the filter tag (case-insensitive,
+    like the filtering)
+    """
+    parts = [re.escape(VOYEUR_MARKER)]
+    if filter_tag:
+        parts.append(re.escape(filter_tag))
+    return re.compile("|".join(parts), re.IGNORECASE)
+
+
 def clean_voyeur_marks_from_notes(notes, filter_tag=None):
     """
     Remove 'NOTE-VOYEUR: TARGET ACQUIRED!' marks and filter tags from note titles and bodies
@@ -704,40 +1480,42 @@ def clean_voyeur_marks_from_notes(notes, filter_tag=None):
     Returns:
         List of cleaned note dictionaries
     """
-    marker = "NOTE-VOYEUR: TARGET ACQUIRED!"
-    cleaned_notes = []
+    return [clean_voyeur_marks_from_note(note, filter_tag) for note in notes]
+
+
+def clean_voyeur_marks_from_note(note, filter_tag=None):
+    """
+    Remove the voyeur mark and filter tag from the title and body of a single note
     
-    for note in notes:
-        cleaned_note = note.copy()
-        
-        # Clean the title - remove marker and filter tag using replace()
-        cleaned_note["title"] = cleaned_note["title"].replace(marker, "").strip()
-        if filter_tag:
-            cleaned_note["title"] = cleaned_note["title"].replace(filter_tag, "").strip()
-        
-        # Clean the body - remove marker and filter tag using replace()
-        cleaned_note["body"] = cleaned_note["body"].replace(marker, "")
-        if filter_tag:
-            cleaned_note["body"] = cleaned_note["body"].replace(filter_tag, "")
-        
-        # Clean up extra whitespace
-        cleaned_note["body"] = cleaned_note["body"].strip()
+    Args:
+        note: Note dictionary with 'title' and 'body' keys
+        filter_tag: Tag string to also remove from the title and body
         
-        cleaned_notes.append(cleaned_note)
-    
-    return cleaned_notes
+    Returns:
+        Cleaned copy of the note dictionary
+    """
+    # Marker and filter tag are removed in one scan of each field
+    marks = _marks_pattern(filter_tag)
+    cleaned_note = note.copy()
+    cleaned_note["title"] = marks.sub("", note["title"]).strip()
+    cleaned_note["body"] = marks.sub("", note["body"]).strip()
+    return cleaned_note
 
 
 def main():
     """
     Main function with command line argument support
     """
+    # One timestamp for the whole run, so "-d 7 -t 1" are relative to the same instant
+    now = datetime.now()
+    date_argument = partial(_date_argument, now=now)
+    
     parser = argparse.ArgumentParser(description='Extract notes from macOS Notes app with filters')
     parser.add_argument('-n', '--limit', type=int, default=5, 
                        help='Number of notes to extract (default: 5)')
-    parser.add_argument('-d', '--from-date', type=str, default=None,
+    parser.add_argument('-d', '--from-date', type=date_argument, default=None,
                        help='Extract notes from this date onwards. Formats: YYYY-MM-DD, DD/MM/YYYY, or days ago (e.g., 7)')
-    parser.add_argument('-t', '--to-date', type=str, default=None,
+    parser.add_argument('-t', '--to-date', type=date_argument, default=None,
                        help='Extract notes up to this date (reverse filtering). Formats: YYYY-MM-DD, DD/MM/YYYY, or days ago (e.g., 7)')
     parser.add_argument('--filter-tag', type=str, default=None,
                        help='Filter notes containing this tag/string in title or body (case-insensitive)')
@@ -749,48 +1527,58 @@ def main():
                        help='Show only statistics, do not extract notes')
     parser.add_argument('-o', '--output', type=str, default=None,
                        help='Force output filename (e.g., my_notes.json). If not specified, auto-generates descriptive filename.')
+    parser.add_argument('--preview', action='store_true',
+                       help=f'Only read the first {PREVIEW_LENGTH} characters of text of each note (much faster for notes with attachments; the export then contains previews)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always read notes from Notes, ignoring the cache in ~/.cache/note-voyeur')
+    parser.add_argument('--jsonl', action='store_true',
+                       help='Write the export as JSON Lines (one note per line, .jsonl) instead of a JSON array')
     
     args = parser.parse_args()
     
-    # Parse the dates
-    from_date = parse_date_string(args.from_date) if args.from_date else None
-    to_date = parse_date_string(args.to_date) if args.to_date else None
+    if args.no_cache:
+        global NOTES_CACHE_PATH
+        NOTES_CACHE_PATH = None
+    
+    from_date = args.from_date
+    to_date = args.to_date
     filter_tag = args.filter_tag
+    # Each date is formatted once for the messages
+    from_day = from_date.strftime('%Y-%m-%d') if from_date else None
+    to_day = to_date.strftime('%Y-%m-%d') if to_date else None
+    if from_date and to_date:
+        date_scope = f"between {from_day} and {to_day}"
+    elif from_date:
+        date_scope = f"from {from_day}"
+    elif to_date:
+        date_scope = f"before {to_day}"
+    else:
+        date_scope = ""
+    # The tag can appear anywhere in a note, so filtering needs the full bodies
+    preview = args.preview and not filter_tag
     
     print("=" * 60)
     print("NOTE VOYEUR - macOS Notes Extractor")
     print("=" * 60)
     
-    # Show statistics
+    # Show statistics (reading the notes in the same pass unless only stats are wanted)
+    notes = None
     if args.count or args.stats_only:
-        total_notes = count_total_notes()
+        total_notes, filtered_count, notes = read_all_stats_and_notes(
+            args.limit, from_date, to_date, filter_tag, include_notes=not args.stats_only, preview=preview
+        )
         print(f"\nSTATISTICS:")
         print(f"Total notes in Notes app: {total_notes}")
         
         if filter_tag:
             print(f"Tag filter: '{filter_tag}' (applied after extraction)")
         
-        if from_date and to_date:
-            # Range filtering statistics
-            filtered_count = count_notes_in_range(from_date, to_date)
-            print(f"Notes modified between {from_date.strftime('%Y-%m-%d')} and {to_date.strftime('%Y-%m-%d')}: {filtered_count}")
-            base_extract = min(args.limit, filtered_count)
-            print(f"Will extract: {base_extract} notes{' (before tag filtering)' if filter_tag else ''}")
-        elif from_date:
-            # Forward filtering statistics
-            filtered_count = count_notes_from_date(from_date)
-            print(f"Notes modified from {from_date.strftime('%Y-%m-%d')}: {filtered_count}")
-            base_extract = min(args.limit, filtered_count)
-            print(f"Will extract: {base_extract} notes{' (before tag filtering)' if filter_tag else ''}")
-        elif to_date:
-            # Reverse filtering statistics
-            filtered_count = count_notes_to_date(to_date)
-            print(f"Notes modified before {to_date.strftime('%Y-%m-%d')}: {filtered_count}")
-            base_extract = min(args.limit, filtered_count)
-            print(f"Will extract: {base_extract} notes{' (before tag filtering)' if filter_tag else ''}")
+        tag_note = ' (before tag filtering)' if filter_tag else ''
+        if date_scope:
+            print(f"Notes modified {date_scope}: {filtered_count}")
+            print(f"Will extract: {min(args.limit, filtered_count)} notes{tag_note}")
         else:
-            base_extract = min(args.limit, total_notes)
-            print(f"Will extract: {base_extract} most recent notes{' (before tag filtering)' if filter_tag else ''}")
+            print(f"Will extract: {min(args.limit, total_notes)} most recent notes{tag_note}")
     
     # Exit if only stats requested
     if args.stats_only:
@@ -800,22 +1588,18 @@ def main():
     filter_msg = f" (filtering by tag: '{filter_tag}')" if filter_tag else ""
     mark_msg = " [WILL MARK WITH VOYEUR TAG]" if args.mark else ""
     
-    if from_date and to_date:
-        print(f"\nExtracting up to {args.limit} notes between {from_date.strftime('%Y-%m-%d')} and {to_date.strftime('%Y-%m-%d')}{filter_msg}{mark_msg}...")
-        notes = read_notes_with_filters(args.limit, from_date, to_date, filter_tag)
-    elif from_date:
-        print(f"\nExtracting up to {args.limit} notes modified from {from_date.strftime('%Y-%m-%d')}{filter_msg}{mark_msg}...")
-        notes = read_notes_with_filters(args.limit, from_date, None, filter_tag)
-    elif to_date:
-        print(f"\nExtracting up to {args.limit} notes modified before {to_date.strftime('%Y-%m-%d')}{filter_msg}{mark_msg}...")
-        notes = read_notes_with_filters(args.limit, None, to_date, filter_tag)
+    if date_scope or filter_tag:
+        print(f"\nExtracting up to {args.limit} notes{' modified ' + date_scope if date_scope else ''}{filter_msg}{mark_msg}...")
     else:
-        if filter_tag:
-            print(f"\nExtracting up to {args.limit} notes{filter_msg}{mark_msg}...")
-            notes = read_notes_with_filters(args.limit, None, None, filter_tag)
+        print(f"\nExtracting last {args.limit} notes{mark_msg}...")
+    
+    # Notes were already read together with the statistics when --count is given
+    if notes is None:
+        if date_scope or filter_tag:
+            notes = read_notes_with_filters(args.limit, from_date, to_date, filter_tag, preview)
         else:
-            print(f"\nExtracting last {args.limit} notes{mark_msg}...")
-            notes = read_notes_structured(args.limit)
+            # Without any filter these are simply the latest notes
+            notes = read_notes_structured(args.limit, preview)
     
     # Display results
     if notes:
@@ -825,30 +1609,16 @@ def main():
         display_notes(cleaned_notes)
         
         # Save to file with descriptive name or forced output name
-        if args.output:
-            filename = args.output
-            # Ensure .json extension if not provided
-            if not filename.endswith('.json'):
-                filename += '.json'
-        else:
-            # Auto-generate descriptive filename
-            tag_suffix = f"_tag_{filter_tag.replace(' ', '_')}" if filter_tag else ""
-            mark_suffix = "_marked" if args.mark else ""
-            
-            if from_date and to_date:
-                filename = f"notes_export_{from_date.strftime('%Y%m%d')}_to_{to_date.strftime('%Y%m%d')}{tag_suffix}{mark_suffix}_limit_{args.limit}.json"
-            elif from_date:
-                filename = f"notes_export_from_{from_date.strftime('%Y%m%d')}{tag_suffix}{mark_suffix}_limit_{args.limit}.json"
-            elif to_date:
-                filename = f"notes_export_before_{to_date.strftime('%Y%m%d')}{tag_suffix}{mark_suffix}_limit_{args.limit}.json"
-            else:
-                filename = f"notes_export_last{tag_suffix}{mark_suffix}_{args.limit}.json"
-        
-        save_notes_to_file(cleaned_notes, filename)
+        filename = build_export_filename(args, from_date, to_date, filter_tag)
         
-        # Mark notes AFTER extraction and saving (using original note data to preserve filter-tags)
-        if args.mark:
-            marked_count = mark_notes_with_voyeur_tag(notes)
+        # Mark notes AFTER extraction (using original note data to preserve filter-tags); Notes is
+        # updated while the export is written, and the marking report follows the save message
+        if not args.mark:
+            save_notes_to_file(cleaned_notes, filename)
+        else:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                save_future = executor.submit(save_notes_to_file, cleaned_notes, filename)
+                marked_count = mark_notes_with_voyeur_tag(notes, before_report=save_future.result)
             if marked_count > 0:
                 print(f"\n✅ Successfully marked {marked_count} notes with VOYEUR tag!")
             else:
@@ -870,15 +1640,16 @@ def interactive_main():
     print("\n" + "="*60)
     print(f"METHOD 1: Simple AppleScript Output (last {limit} notes)")
     print("="*60)
-    simple_output = read_all_notes(limit)
-    if simple_output:
-        print(simple_output)
+    # Both methods show the same read: Method 2 only leaves out the notes already marked
+    latest = _read_latest_notes(limit)
+    if latest:
+        print(_format_notes_simple(latest))
     
     # Method 2: Structured output
     print("\n" + "="*60)
     print(f"METHOD 2: Structured Note Data (last {limit} notes)")
     print("="*60)
-    notes = read_notes_structured(limit)
+    notes = apply_marker_and_tag_filters(latest) if latest is not None else []
     display_notes(notes)
     
     # Save to file
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter for Note Voyeur
+Client-side token bucket that keeps OpenAI requests under the account's
+requests-per-minute and tokens-per-minute limits
+"""
+
+import asyncio
+import functools
+import time
+from typing import Any, Dict, Optional
+
+# tiktoken is optional: without it token counts are estimated from text length
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+@functools.lru_cache(maxsize=8)
+def _encoding_for_model(model: str):
+    """
+    Return the tiktoken encoding of a model, defaulting to o200k_base for unknown models
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: str = "") -> int:
+    """
+    Count the tokens of a text for a model
+
+    Args:
+        text: Text to count
+        model: Model name used to pick the tokenizer
+
+    Returns:
+        Exact count with tiktoken, otherwise an estimate from the text length
+    """
+    if tiktoken is not None:
+        return len(_encoding_for_model(model).encode(text))
+    # Roughly 4 characters per token for English text
+    return len(text) // 4
+
+
+def estimate_tokens(request: Dict[str, Any]) -> int:
+    """
+    Estimate the tokens a chat completion request consumes against the TPM limit
+
+    Args:
+        request: Keyword arguments passed to chat.completions.create
+
+    Returns:
+        Prompt tokens plus the completion budget (max_tokens)
+    """
+    text = "".join(str(message.get('content', '')) for message in request.get('messages', []))
+    return count_tokens(text, request.get('model', '')) + int(request.get('max_tokens', 0))
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket limiting both requests and tokens per minute
+    """
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        """
+        Initialize the limiter with full capacity
+
+        Args:
+            requests_per_minute: Maximum requests per minute (None for no limit)
+            tokens_per_minute: Maximum tokens per minute (None for no limit)
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_request_capacity = float(requests_per_minute or 0)
+        self.available_token_capacity = float(tokens_per_minute or 0)
+        self.last_update = time.monotonic()
+        # Created on first use: before Python 3.10 a Lock binds to the event loop current at creation
+        self._lock = None
+
+    def _refill(self) -> None:
+        """
+        Add the capacity accrued since the last update, capped at one minute's worth
+        """
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        if self.requests_per_minute:
+            self.available_request_capacity = min(
+                self.available_request_capacity + elapsed * self.requests_per_minute / 60.0,
+                float(self.requests_per_minute)
+            )
+        if self.tokens_per_minute:
+            self.available_token_capacity = min(
+                self.available_token_capacity + elapsed * self.tokens_per_minute / 60.0,
+                float(self.tokens_per_minute)
+            )
+
+    async def acquire(self, tokens: int) -> None:
+        """
+        Wait until one request of the given token cost fits in both buckets, then consume it
+
+        Args:
+            tokens: Estimated tokens of the request
+        """
+        if not self.requests_per_minute and not self.tokens_per_minute:
+            return
+
+        # A request larger than the whole bucket is let through once the bucket is full
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = 0.0
+                if self.requests_per_minute and self.available_request_capacity < 1:
+                    wait = (1 - self.available_request_capacity) * 60.0 / self.requests_per_minute
+                if self.tokens_per_minute and self.available_token_capacity < tokens:
+                    wait = max(wait, (tokens - self.available_token_capacity) * 60.0 / self.tokens_per_minute)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self.requests_per_minute:
+                self.available_request_capacity -= 1
+            if self.tokens_per_minute:
+                self.available_token_capacity -= tokens